@@ -0,0 +1,459 @@
+"""
+Benchmarks for every solver on synthetic inputs of increasing size.
+
+    python bench.py                 # run everything, compare to benchmarks.json
+    python bench.py 8 12 --save     # run some days, save them as the new baseline
+
+Each case runs in a fresh process (so peak RSS means something) and records
+the wall time for parse + solve, the peak RSS of that process and the peak
+memory allocated while solving (from tracemalloc, in a second run).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from string import ascii_letters, ascii_lowercase
+from typing import Callable, Iterator, NamedTuple
+
+import solvers
+
+BASELINE = solvers.HERE / "benchmarks.json"
+
+Generator = Callable[[random.Random, int], str]
+
+
+def name(i: int, length: int = 4) -> str:
+    """a unique lowercase name for every i"""
+    letters = []
+    for _ in range(length):
+        i, r = divmod(i, 26)
+        letters.append(ascii_lowercase[r])
+    return "".join(letters)
+
+
+def gen_day01(rng: random.Random, n: int) -> str:
+    return "\n\n".join(
+        "\n".join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 10)))
+        for _ in range(n)
+    )
+
+
+def gen_day02(rng: random.Random, n: int) -> str:
+    return "\n".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(n))
+
+
+def gen_day03(rng: random.Random, n: int) -> str:
+    # every group of three shares exactly one badge, and every rucksack
+    # has exactly one item in both compartments
+    lines = []
+    for _ in range(n // 3):
+        letters = list(ascii_letters)
+        rng.shuffle(letters)
+        badge, rest = letters[0], letters[1:]
+        for k in range(3):
+            pool = rest[17 * k: 17 * (k + 1)]
+            dup, left, right = pool[0], pool[1:9], pool[9:]
+            size = rng.randint(8, 16)
+            c1 = [badge, dup] + rng.choices(left, k=size - 2)
+            c2 = [dup] + rng.choices(right, k=size - 1)
+            rng.shuffle(c1)
+            rng.shuffle(c2)
+            lines.append("".join(c1 + c2))
+    return "\n".join(lines)
+
+
+def gen_day04(rng: random.Random, n: int) -> str:
+    def rng_range() -> str:
+        lo = rng.randint(1, 99)
+        return f"{lo}-{rng.randint(lo, 99)}"
+    return "\n".join(f"{rng_range()},{rng_range()}" for _ in range(n))
+
+
+def gen_day05(rng: random.Random, n: int) -> str:
+    num_stacks = 9
+    heights = [rng.randint(10, 30) for _ in range(num_stacks)]
+    tallest = max(heights)
+
+    rows = []
+    for level in reversed(range(tallest)):
+        rows.append(" ".join(
+            f"[{rng.choice(ascii_lowercase.upper())}]" if level < h else "   "
+            for h in heights
+        ))
+    rows.append(" ".join(f" {i + 1} " for i in range(num_stacks)))
+
+    # never empty a stack, so that every stack has a top at the end
+    moves = []
+    for _ in range(n):
+        from_ = rng.choice([i for i, h in enumerate(heights) if h > 1])
+        to = rng.choice([i for i in range(num_stacks) if i != from_])
+        quantity = rng.randint(1, heights[from_] - 1)
+        heights[from_] -= quantity
+        heights[to] += quantity
+        moves.append(f"move {quantity} from {from_ + 1} to {to + 1}")
+
+    return "\n".join(rows) + "\n\n" + "\n".join(moves)
+
+
+def gen_day06(rng: random.Random, n: int) -> str:
+    # three letters can never make a marker, so both markers are at the end
+    return "".join(rng.choices("abc", k=n)) + ascii_lowercase[3:17]
+
+
+def gen_day07(rng: random.Random, n: int) -> str:
+    # everything below one top level directory, and about 50M in total,
+    # so that part 2 always has a directory big enough to delete
+    children: list[list[int]] = [[] for _ in range(n)]
+    for i in range(1, n):
+        children[rng.randrange(1, i) if i > 1 else 0].append(i)
+    max_size = 50_000_000 // n
+
+    # walk the tree, None means go back up
+    lines = ["$ cd /"]
+    stack: list[int | None] = [0]
+    while stack:
+        d = stack.pop()
+        if d is None:
+            lines.append("$ cd ..")
+            continue
+        if d != 0:
+            lines.append(f"$ cd {name(d)}")
+        lines.append("$ ls")
+        lines.extend(f"dir {name(c)}" for c in children[d])
+        lines.extend(f"{rng.randint(1, max_size)} {name(f)}.txt" for f in range(rng.randint(1, 3)))
+        for c in reversed(children[d]):
+            stack.extend([None, c])
+    return "\n".join(lines)
+
+
+def gen_grid_digits(rng: random.Random, n: int) -> str:
+    return "\n".join("".join(rng.choices("0123456789", k=n)) for _ in range(n))
+
+
+def gen_day09(rng: random.Random, n: int) -> str:
+    return "\n".join(f"{rng.choice('UDLR')} {rng.randint(1, 20)}" for _ in range(n))
+
+
+def gen_day10(rng: random.Random, n: int) -> str:
+    # at least 240 cycles, so that there's a whole screen to draw
+    return "\n".join(
+        "noop" if rng.random() < 0.3 else f"addx {rng.randint(-5, 5)}"
+        for _ in range(max(n, 240))
+    )
+
+
+def gen_day11(rng: random.Random, n: int) -> str:
+    primes = [2, 3, 5, 7, 11, 13, 17, 19]
+    operations = ["old * 19", "old + 6", "old * old", "old + 3"]
+    items: list[list[int]] = [[] for _ in primes]
+    for _ in range(n):
+        rng.choice(items).append(rng.randint(50, 100))
+
+    monkeys = []
+    for i, p in enumerate(primes):
+        monkeys.append(f"""Monkey {i}:
+  Starting items: {", ".join(str(x) for x in items[i]) or "1"}
+  Operation: new = {rng.choice(operations)}
+  Test: divisible by {p}
+    If true: throw to monkey {(i + 1) % len(primes)}
+    If false: throw to monkey {(i + 3) % len(primes)}""")
+    return "\n\n".join(monkeys)
+
+
+def gen_day12(rng: random.Random, n: int) -> str:
+    # a ramp from a to z, so there's always a path
+    nr, nc = n, 2 * n
+    rows = []
+    for i in range(nr):
+        rows.append("".join(
+            ascii_lowercase[min(25, (i + j) * 26 // (nr + nc - 1))]
+            for j in range(nc)
+        ))
+    rows[0] = "S" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "E"
+    return "\n".join(rows)
+
+
+def gen_day13(rng: random.Random, n: int) -> str:
+    def packet(depth: int = 0) -> list:
+        return [
+            packet(depth + 1) if depth < 3 and rng.random() < 0.3 else rng.randint(0, 10)
+            for _ in range(rng.randint(0, 5))
+        ]
+    return "\n\n".join(
+        f"{packet()}\n{packet()}".replace(" ", "")
+        for _ in range(n)
+    )
+
+
+def gen_day14(rng: random.Random, n: int) -> str:
+    depth = 20 + n // 2
+    # a narrow ledge under the entry point, so some sand comes to rest in
+    # part 1 but the pile never reaches the entry point
+    lines = [f"{500 - depth // 4},{depth + 2} -> {500 + depth // 4},{depth + 2}"]
+    for _ in range(n):
+        x, y = rng.randint(500 - depth, 500 + depth), rng.randint(2, depth)
+        points = [(x, y)]
+        for k in range(rng.randint(1, 3)):
+            if k % 2 == 0:
+                x += rng.randint(-5, 5) or 1
+            else:
+                y = max(2, min(depth, y + (rng.randint(-5, 5) or 1)))
+            points.append((x, y))
+        lines.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return "\n".join(lines)
+
+
+def _sensor(x: int, y: int, bx: int, by: int) -> str:
+    return f"Sensor at x={x}, y={y}: closest beacon is at x={bx}, y={by}"
+
+
+def gen_day15_row(rng: random.Random, n: int) -> str:
+    # sensors near the row that part 1 looks at
+    lines = [_sensor(2_000_000, 2_000_000, 2_000_100, 2_000_000)]
+    for _ in range(n - 1):
+        x, y = rng.randint(0, 4_000_000), rng.randint(1_995_000, 2_005_000)
+        lines.append(_sensor(x, y, x + rng.randint(0, 5000), y + rng.randint(0, 5000)))
+    return "\n".join(lines)
+
+
+def gen_day15_gap(rng: random.Random, n: int) -> str:
+    # four huge diagonal diamonds cover the whole square except for one gap
+    # in row 1000, plus some smaller sensors that stay clear of the gap
+    gx, gy = rng.randint(0, 4_000_000), 1000
+    a = 4_000_001
+    lines = [
+        _sensor(gx + dx * a, gy + dy * a, gx + dx * a + 2 * a - 1, gy + dy * a)
+        for dx in (-1, 1) for dy in (-1, 1)
+    ]
+    while len(lines) < n + 4:
+        x, y = rng.randint(0, 4_000_000), rng.randint(0, 4_000_000)
+        radius = min(abs(x - gx) + abs(y - gy) - 1, 5000)
+        if radius >= 0:
+            lines.append(_sensor(x, y, x + radius, y))
+    return "\n".join(lines)
+
+
+def gen_day16(rng: random.Random, n: int) -> str:
+    # n valves with flow, hidden among twice as many without
+    total = 3 * n
+    names = ["AA"] + [ascii_lowercase.upper()[i // 26] + ascii_lowercase.upper()[i % 26] for i in range(1, total)]
+    edges: set[tuple[int, int]] = set()
+    for i in range(1, total):
+        edges.add((rng.randrange(i), i))
+    for _ in range(n):
+        i, j = rng.sample(range(total), 2)
+        edges.add((min(i, j), max(i, j)))
+
+    neighbors: list[list[str]] = [[] for _ in range(total)]
+    for i, j in edges:
+        neighbors[i].append(names[j])
+        neighbors[j].append(names[i])
+
+    flowing = set(rng.sample(range(1, total), n))
+    lines = []
+    for i, valve in enumerate(names):
+        flow = rng.randint(1, 25) if i in flowing else 0
+        tunnels = ", ".join(neighbors[i])
+        if len(neighbors[i]) == 1:
+            lines.append(f"Valve {valve} has flow rate={flow}; tunnel leads to valve {tunnels}")
+        else:
+            lines.append(f"Valve {valve} has flow rate={flow}; tunnels lead to valves {tunnels}")
+    return "\n".join(lines)
+
+
+def gen_day17(rng: random.Random, n: int) -> str:
+    return "".join(rng.choices("<>", k=n))
+
+
+def gen_day18(rng: random.Random, n: int) -> str:
+    side = max(3, round((2 * n) ** (1 / 3)))
+    points: set[tuple[int, int, int]] = set()
+    while len(points) < n:
+        points.add((rng.randint(0, side), rng.randint(0, side), rng.randint(0, side)))
+    return "\n".join(f"{x},{y},{z}" for x, y, z in points)
+
+
+def gen_day19(rng: random.Random, n: int) -> str:
+    return "\n".join(
+        f"Blueprint {i + 1}: Each ore robot costs {rng.randint(2, 4)} ore. "
+        f"Each clay robot costs {rng.randint(2, 4)} ore. "
+        f"Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 15)} clay. "
+        f"Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 15)} obsidian."
+        for i in range(n)
+    )
+
+
+def gen_day20(rng: random.Random, n: int) -> str:
+    numbers = [rng.randint(-10_000, 10_000) for _ in range(n - 1)] + [0]
+    rng.shuffle(numbers)
+    return "\n".join(str(x) for x in numbers)
+
+
+def gen_day21(rng: random.Random, n: int) -> str:
+    # merge random pairs of monkeys until only root is left;
+    # no - or / so nothing is ever divided by zero
+    lines = [f"humn: {rng.randint(1, 5)}"]
+    pool = ["humn"]
+    for i in range(1, n):
+        lines.append(f"{name(i)}: {rng.randint(1, 5)}")
+        pool.append(name(i))
+
+    i = n
+    while len(pool) > 1:
+        left = pool.pop(rng.randrange(len(pool)))
+        right = pool.pop(rng.randrange(len(pool)))
+        monkey = "root" if not pool else name(i)
+        lines.append(f"{monkey}: {left} {rng.choice('+*')} {right}")
+        pool.append(monkey)
+        i += 1
+
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+class Case(NamedTuple):
+    day: int
+    part: int
+    generate: Generator
+    sizes: list[int]
+
+
+CASES = [
+    Case(1, 1, gen_day01, [1_000, 10_000, 100_000]),
+    Case(1, 2, gen_day01, [1_000, 10_000, 100_000]),
+    Case(2, 1, gen_day02, [1_000, 10_000, 100_000]),
+    Case(2, 2, gen_day02, [1_000, 10_000, 100_000]),
+    Case(3, 1, gen_day03, [999, 9_999, 99_999]),
+    Case(3, 2, gen_day03, [999, 9_999, 99_999]),
+    Case(4, 1, gen_day04, [1_000, 10_000, 100_000]),
+    Case(4, 2, gen_day04, [1_000, 10_000, 100_000]),
+    Case(5, 1, gen_day05, [1_000, 10_000, 100_000]),
+    Case(5, 2, gen_day05, [1_000, 10_000, 100_000]),
+    Case(6, 1, gen_day06, [10_000, 100_000, 1_000_000]),
+    Case(6, 2, gen_day06, [10_000, 100_000, 1_000_000]),
+    Case(7, 1, gen_day07, [100, 1_000, 10_000]),
+    Case(7, 2, gen_day07, [100, 1_000, 10_000]),
+    Case(8, 1, gen_grid_digits, [50, 100, 200]),
+    Case(8, 2, gen_grid_digits, [50, 100, 200]),
+    Case(9, 1, gen_day09, [1_000, 10_000, 100_000]),
+    Case(9, 2, gen_day09, [1_000, 10_000, 100_000]),
+    Case(10, 1, gen_day10, [1_000, 10_000, 100_000]),
+    Case(10, 2, gen_day10, [1_000, 10_000, 100_000]),
+    Case(11, 1, gen_day11, [10, 40, 160]),
+    Case(11, 2, gen_day11, [10, 40, 160]),
+    Case(12, 1, gen_day12, [20, 40, 80]),
+    Case(12, 2, gen_day12, [20, 40, 80]),
+    Case(13, 1, gen_day13, [100, 1_000, 10_000]),
+    Case(13, 2, gen_day13, [100, 1_000, 10_000]),
+    Case(14, 1, gen_day14, [10, 40, 160]),
+    Case(14, 2, gen_day14, [10, 40, 160]),
+    Case(15, 1, gen_day15_row, [10, 40, 160]),
+    Case(15, 2, gen_day15_gap, [10, 40, 160]),
+    Case(16, 1, gen_day16, [4, 6, 8]),
+    Case(16, 2, gen_day16, [4, 6, 8]),
+    Case(17, 1, gen_day17, [10, 100, 1_000]),
+    Case(18, 1, gen_day18, [100, 1_000, 10_000]),
+    Case(18, 2, gen_day18, [100, 1_000, 10_000]),
+    Case(19, 1, gen_day19, [1, 2]),
+    Case(20, 1, gen_day20, [127, 331, 1_009]),
+    Case(20, 2, gen_day20, [127, 331, 1_009]),
+    Case(21, 1, gen_day21, [100, 1_000, 10_000]),
+    Case(21, 2, gen_day21, [100, 1_000, 10_000]),
+]
+
+
+def key(case: Case, n: int) -> str:
+    return f"day{case.day:02} part{case.part} n={n}"
+
+
+def max_rss_kb() -> int:
+    # ru_maxrss survives exec on linux, so it would include the parent's
+    # memory; VmHWM starts over with the new process
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except FileNotFoundError:
+        pass
+    # kilobytes on linux, bytes on macos
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(day: int, part: int, raw: str, trace: bool = True) -> dict:
+    """runs in its own process, so that ru_maxrss belongs to this case"""
+    solver = solvers.get_solver(day)
+    fn = solver.part1 if part == 1 else solver.part2
+    assert fn is not None
+
+    result = {}
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull), redirect_stderr(devnull):
+        start = time.perf_counter()
+        fn(solver.parse(raw))
+        result["seconds"] = time.perf_counter() - start
+
+        if trace:
+            tracemalloc.start()
+            fn(solver.parse(raw))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["peak_alloc_bytes"] = peak
+
+    result["max_rss_kb"] = max_rss_kb()
+    return result
+
+
+def run(cases: list[Case], trace: bool = True) -> Iterator[tuple[str, dict]]:
+    for case in cases:
+        for n in case.sizes:
+            raw = case.generate(random.Random(n), n)
+            # spawn a fresh interpreter, so that the parent's memory
+            # doesn't show up in the peak RSS
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(measure, case.day, case.part, raw, trace).result()
+            yield key(case, n), result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("days", nargs="*", type=int)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown before it's a regression")
+    parser.add_argument("--no-trace", action="store_true", help="skip the tracemalloc run")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if not args.days or case.day in args.days]
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    results = {}
+    regressions = []
+    for k, result in run(cases, trace=not args.no_trace):
+        results[k] = result
+        line = f"{k:<24} {result['seconds']:9.4f}s {result['max_rss_kb'] / 1024:8.1f}MB rss"
+        if "peak_alloc_bytes" in result:
+            line += f" {result['peak_alloc_bytes'] / 1024 / 1024:8.1f}MB alloc"
+
+        if k in baseline:
+            ratio = result["seconds"] / baseline[k]["seconds"]
+            line += f" {ratio:6.2f}x baseline"
+            if ratio > 1 + args.tolerance:
+                line += " REGRESSION"
+                regressions.append(k)
+        print(line, flush=True)
+
+    if args.save:
+        args.baseline.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + "\n")
+
+    if regressions:
+        print(f"{len(regressions)} regressions")
+        raise SystemExit(1)
@@ -0,0 +1,73 @@
+"""
+An on-disk cache of answers, keyed by the SHA-256 of the input bytes and
+the version of the solver, so the same input is only ever solved once.
+
+Each answer is its own little JSON file. Reading an entry touches it, and
+when the cache gets bigger than max_bytes the least recently used entries
+are deleted.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import solvers
+
+DEFAULT_DIR = solvers.HERE / ".cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+MISSING = object()
+
+
+class ResultCache:
+    def __init__(self, root: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, day: int, part: int, raw: bytes) -> Path:
+        digest = hashlib.sha256(raw).hexdigest()
+        version = solvers.get_solver(day).version
+        return self.root / f"{digest}-day{day:02}-part{part}-{version}.json"
+
+    def get(self, day: int, part: int, raw: bytes) -> Any:
+        """the cached answer, or MISSING"""
+        path = self.path(day, part, raw)
+        try:
+            answer = json.loads(path.read_text())["answer"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return MISSING
+
+        # mark it as recently used
+        path.touch()
+        return answer
+
+    def put(self, day: int, part: int, raw: bytes, answer: Any) -> None:
+        path = self.path(day, part, raw)
+
+        # write to a temp file and rename, so readers never see half an entry
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"day": day, "part": part, "answer": answer}))
+        tmp.replace(path)
+
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for p in self.root.glob("*.json"):
+            try:
+                entries.append((p.stat(), p))
+            except FileNotFoundError:
+                # another runner evicted or replaced it since the glob
+                continue
+        total = sum(stat.st_size for stat, _ in entries)
+
+        # oldest first
+        entries.sort(key=lambda entry: entry[0].st_mtime)
+
+        for stat, p in entries:
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= stat.st_size
@@ -1,4 +1,12 @@
+import heapq
+import io
+import mmap
 from dataclasses import dataclass
+from typing import IO, Iterable, Iterator
+
+import numpy as np
+
+import loader
 
 RAW = """1000
 2000
@@ -23,18 +31,140 @@ class Elf:
         return sum(self.foods)
 
 
-def parse(raw: str) -> list[Elf]:
+def parse(raw: loader.Source) -> list[Elf]:
     return [
-        Elf([int(x) for x in line.split("\n")]) 
-        for line in raw.strip().split("\n\n")
+        Elf([int(x) for x in record])
+        for record in loader.iter_records(raw)
     ]
 
-with open('day01.txt') as f:
-    elves = parse(f.read())
 
-# print the calories of the elf with the most calories
-print(max(elf.cals() for elf in elves))
+def part1(elves: list[Elf]) -> int:
+    # the calories of the elf with the most calories
+    return max(elf.cals() for elf in elves)
+
+
+def part2(elves: list[Elf]) -> int:
+    # the total calories for the three elves with the most calories
+    return sum(top_k(elf.cals() for elf in elves))
+
+
+### Streaming, for when the elves don't all fit in memory
+
+def stream_totals(source: loader.Source | IO[str] | IO[bytes] | Iterable[Iterable[str]]) -> Iterator[int]:
+    """
+    the calories of each elf, one at a time, from the input, an open file,
+    or an already split up iterator of each elf's foods
+    """
+    if isinstance(source, (str, bytes, mmap.mmap, io.IOBase)):
+        source = loader.iter_records(source)
+    for foods in source:
+        yield sum(int(food) for food in foods)
+
+
+def top_k(totals: Iterable[int], k: int = 3) -> list[int]:
+    """the k largest totals, largest first, only ever holding k of them"""
+    if k <= 0:
+        return []
+
+    # a min-heap, so the smallest of the top k is the one to replace
+    heap: list[int] = []
+    for total in totals:
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+### Columnar, for when there are millions of elves
+
+# int64 holds any 18 digit number
+MAX_DIGITS = 18
+
+# how much of the input parse_columnar works on at once
+CHUNK_SIZE = 1 << 20
+
+def parse_columnar(raw: loader.Source) -> tuple[np.ndarray, np.ndarray]:
+    """
+    every food in one int64 array, plus the offset of each elf's first food,
+    parsed straight from the bytes a chunk at a time, so apart from the
+    result nothing bigger than a chunk's worth of per-line arrays gets built
+    """
+    if isinstance(raw, str):
+        raw = raw.encode()
+
+    all_foods = []
+    all_offsets = []
+    num_foods = 0
+    pos = 0
+    while pos < len(raw):
+        # split just after the end of an elf, so no elf is in two chunks
+        end = raw.find(b"\n\n", pos + CHUNK_SIZE)
+        end = len(raw) if end == -1 else end + 1
+        foods, offsets = parse_chunk(np.frombuffer(raw, dtype=np.uint8, count=end - pos, offset=pos))
+        all_foods.append(foods)
+        all_offsets.append(offsets + num_foods)
+        num_foods += len(foods)
+        pos = end
+
+    if not all_foods:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(all_foods), np.concatenate(all_offsets)
+
+def parse_chunk(buf: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """parse_columnar for one chunk, working a line at a time rather than a byte at a time"""
+    newlines = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+    nonempty = ends > starts
+
+    # each food is a nonempty line, and a blank line starts a new elf
+    elf_ids = np.cumsum(~nonempty)[nonempty]
+    offsets = np.flatnonzero(np.diff(elf_ids, prepend=-1))
+
+    ends = ends[nonempty]
+    lengths = ends - starts[nonempty]
+    longest = int(lengths.max()) if len(lengths) else 0
+    if longest > MAX_DIGITS:
+        raise ValueError(f"foods can have at most {MAX_DIGITS} digits")
+
+    # add in the k-th digit from the end of every line long enough to have one
+    foods = np.zeros(len(lengths), dtype=np.int64)
+    for k in range(longest):
+        lines = np.flatnonzero(lengths > k)
+        digits = buf[ends[lines] - 1 - k] - ord("0")
+        if (digits > 9).any():
+            # anything below '0' wrapped round, since it's unsigned
+            raise ValueError("expected only digits and newlines")
+        foods[lines] += digits.astype(np.int64) * 10 ** k
+
+    return foods, offsets
+
+
+def elf_totals(foods: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    if len(foods) == 0:
+        return foods
+    return np.add.reduceat(foods, offsets)
+
+
+def top_k_total(totals: np.ndarray, k: int = 3) -> int:
+    # only the top k need to end up in order, so no full sort
+    k = min(k, len(totals))
+    if k == 0:
+        return 0
+    return int(np.partition(totals, len(totals) - k)[-k:].sum())
+
+
+if __name__ == "__main__":
+    TOTALS = elf_totals(*parse_columnar(RAW))
+    assert TOTALS.max() == part1(parse(RAW)) == 24000
+    assert top_k_total(TOTALS) == part2(parse(RAW)) == 45000
+    assert top_k(stream_totals(RAW), 1) == [24000]
+    assert top_k(stream_totals(RAW), 10) == [24000, 11000, 10000, 6000, 4000]
+    assert top_k(stream_totals(io.BytesIO(RAW.encode())), 1) == [24000]
 
-# print the total calories for the three elves with the most calories
-print(sum(elf.cals() for elf in sorted(elves, key=lambda elf: elf.cals(), reverse=True)[:3]))
+    with open('day01.txt') as f:
+        elves = parse(f.read())
 
+    print(part1(elves))
+    print(part2(elves))
@@ -1,5 +1,9 @@
 from enum import Enum
 
+import numpy as np
+
+import loader
+
 class Rps(Enum):
     ROCK = 1
     PAPER = 2
@@ -62,7 +66,7 @@ RAW = """A Y
 B X
 C Z"""
 
-def parse(raw: str) -> list[list[Rps]]:
+def parse_rounds(raw: str) -> list[list[Rps]]:
     return [
         [Rps.parse(s) for s in line.split()]
         for line in raw.strip().splitlines()
@@ -71,14 +75,6 @@ def parse(raw: str) -> list[list[Rps]]:
 def score_all(lines):
     return sum(score(*line) for line in lines)
 
-lines = parse(RAW)
-assert score_all(parse(RAW)) == 15
-
-with open('day02.txt') as f:
-    raw = f.read()
-    lines = parse(raw)
-    print(score_all(lines))
-
 def parse2(raw: str) -> list[list[Rps]]:
     out = []
     for line in raw.strip().splitlines():
@@ -88,7 +84,45 @@ def parse2(raw: str) -> list[list[Rps]]:
         out.append((opponent, me))
     return out
 
-assert score_all(parse2(RAW)) == 12
+### Lookup table, every line is one of only 9 possibilities
+
+# "A X", "A Y", ..., "C Z", so line index = 3 * opponent + me
+LINES = [f'{opponent} {me}' for opponent in 'ABC' for me in 'XYZ']
+
+SCORES1 = np.array([score(*parse_rounds(line)[0]) for line in LINES])
+SCORES2 = np.array([score_all(parse2(line)) for line in LINES])
+
+def parse(raw: loader.Source) -> np.ndarray:
+    """how many times each of LINES appears, in one pass over the bytes"""
+    if isinstance(raw, str):
+        raw = raw.encode()
+    buf = np.frombuffer(raw, dtype=np.uint8)
+
+    # every line has exactly one space, with a letter either side of it
+    spaces = np.flatnonzero(buf == ord(' '))
+    opponent = buf[spaces - 1].astype(np.intp) - ord('A')
+    me = buf[spaces + 1].astype(np.intp) - ord('X')
+    if ((opponent < 0) | (opponent > 2) | (me < 0) | (me > 2)).any():
+        raise ValueError('invalid line')
+
+    return np.bincount(3 * opponent + me, minlength=len(LINES))
+
+def part1(counts: np.ndarray) -> int:
+    return int(counts @ SCORES1)
+
+def part2(counts: np.ndarray) -> int:
+    return int(counts @ SCORES2)
+
+
+if __name__ == "__main__":
+    assert score_all(parse_rounds(RAW)) == 15
+    assert score_all(parse2(RAW)) == 12
+    assert part1(parse(RAW)) == 15
+    assert part2(parse(RAW)) == 12
+
+    with open('day02.txt') as f:
+        raw = f.read()
+        counts = parse(raw)
 
-lines2 = parse2(raw)
-print(score_all(lines2))
+    print(part1(counts))
+    print(part2(counts))
@@ -1,5 +1,11 @@
+from functools import reduce
+from operator import and_
 from string import ascii_lowercase, ascii_uppercase
 
+import numpy as np
+
+import loader
+
 CHARS = '.' + ascii_lowercase + ascii_uppercase
 
 
@@ -7,9 +13,6 @@ def priority(c: str) -> int:
     return CHARS.index(c)
 
 
-assert priority('a') == 1
-assert priority('L') == 38
-
 def find_duplicate(rucksack: str) -> str:
     n = len(rucksack)
 
@@ -29,26 +32,20 @@ wMqvLMZHhHMvwLHjbvcjnnSBnvTQFn
 ttgJtRGJQctTZtZT
 CrZsJsPPZsGzwwsLwLmpwMDw"""
 
-RUCKSACKS = RAW.strip().split('\n')
-
-assert sum(
-    priority(find_duplicate(rucksack))
-    for rucksack in RUCKSACKS
-) == 157
-
-rucksacks = open('day03.txt').read().strip().split('\n')
+def parse(raw: str) -> list[str]:
+    return raw.strip().split('\n')
 
-print(sum(
-    priority(find_duplicate(rucksack))
-    for rucksack in rucksacks
-))
+RUCKSACKS = parse(RAW)
 
-def groups_of_three(rucksacks: list[str]) -> list[list[str]]:
+def groups(rucksacks: list[str], size: int) -> list[list[str]]:
     return [
-        rucksacks[i:i+3]
-        for i in range(0, len(rucksacks), 3)
+        rucksacks[i:i+size]
+        for i in range(0, len(rucksacks), size)
     ]
 
+def groups_of_three(rucksacks: list[str]) -> list[list[str]]:
+    return groups(rucksacks, 3)
+
 def find_duplicate_in_group(rucksack_group: list[str]) -> str:
     items = set(rucksack_group[0])
     for rucksack in rucksack_group[1:]:
@@ -58,14 +55,123 @@ def find_duplicate_in_group(rucksack_group: list[str]) -> str:
 
     return items.pop()
 
-assert sum(
-    priority(find_duplicate_in_group(group))
-    for group in groups_of_three(RUCKSACKS)
-) == 70
+def part1(rucksacks: list[str]) -> int:
+    return sum(
+        priority(find_duplicate(rucksack))
+        for rucksack in rucksacks
+    )
 
-print(
-    sum(
-        priority(find_duplicate_in_group(group)) 
+def part2(rucksacks: list[str]) -> int:
+    return sum(
+        priority(find_duplicate_in_group(group))
         for group in groups_of_three(rucksacks)
-        )
-)
\ No newline at end of file
+    )
+
+
+
+### Bitmasks, one bit per item type
+
+# the item with priority p is bit p - 1, so priority is just bit_length()
+BITS = {c: 1 << (p - 1) for p, c in enumerate(CHARS) if p}
+
+def mask(items: str) -> int:
+    m = 0
+    for c in items:
+        m |= BITS[c]
+    return m
+
+def mask_priority(m: int) -> int:
+    assert m and m & (m - 1) == 0, 'expected exactly one item'
+    return m.bit_length()
+
+def duplicate_mask(rucksack: str) -> int:
+    n = len(rucksack)
+    return mask(rucksack[:n // 2]) & mask(rucksack[n // 2:])
+
+def group_mask(rucksack_group: list[str]) -> int:
+    return reduce(and_, map(mask, rucksack_group))
+
+def part1_masks(rucksacks: list[str]) -> int:
+    return sum(mask_priority(duplicate_mask(rucksack)) for rucksack in rucksacks)
+
+def part2_masks(rucksacks: list[str], size: int = 3) -> int:
+    return sum(
+        mask_priority(group_mask(group))
+        for group in groups(rucksacks, size)
+    )
+
+
+
+### Vectorised, for millions of rucksacks at once
+
+# byte -> priority, 0 for anything that isn't an item
+PRIORITIES = np.zeros(256, dtype=np.uint8)
+for c in CHARS[1:]:
+    PRIORITIES[ord(c)] = priority(c)
+
+def parse_masks(raw: loader.Source) -> tuple[np.ndarray, np.ndarray]:
+    """
+    the item mask of every rucksack, and of each of its compartments
+    (shape (n, 2)), straight from the bytes of the input
+    """
+    if isinstance(raw, str):
+        raw = raw.encode()
+    buf = np.frombuffer(raw, dtype=np.uint8)
+
+    priorities = PRIORITIES[buf]
+    is_item = priorities > 0
+    bits = np.left_shift(np.uint64(1), priorities[is_item].astype(np.uint64) - np.uint64(1))
+
+    # lines in terms of positions in bits, skipping blank ones
+    breaks = np.flatnonzero(~is_item)
+    starts = np.concatenate(([0], breaks + 1)) - np.arange(len(breaks) + 1)
+    ends = np.concatenate((breaks, [len(buf)])) - np.arange(len(breaks) + 1)
+    nonempty = ends > starts
+    starts, ends = starts[nonempty], ends[nonempty]
+
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros((0, 2), dtype=np.uint64)
+
+    # start, middle, start, middle, ... so every other segment is a compartment
+    halves = np.stack((starts, (starts + ends) // 2), axis=1).ravel()
+    compartments = np.bitwise_or.reduceat(bits, halves).reshape(-1, 2)
+    rucksacks = compartments[:, 0] | compartments[:, 1]
+
+    return rucksacks, compartments
+
+def mask_priorities(masks: np.ndarray) -> np.ndarray:
+    if ((masks == 0) | (masks & (masks - np.uint64(1)) != 0)).any():
+        raise ValueError('expected exactly one item')
+    # exact, since they're all powers of two
+    return np.log2(masks).astype(np.int64) + 1
+
+def part1_vectorised(compartments: np.ndarray) -> int:
+    return int(mask_priorities(compartments[:, 0] & compartments[:, 1]).sum())
+
+def part2_vectorised(rucksacks: np.ndarray, size: int = 3) -> int:
+    if len(rucksacks) % size:
+        raise ValueError(f'{len(rucksacks)} rucksacks can\'t be split into groups of {size}')
+    badges = np.bitwise_and.reduce(rucksacks.reshape(-1, size), axis=1)
+    return int(mask_priorities(badges).sum())
+
+
+if __name__ == "__main__":
+    assert priority('a') == 1
+    assert priority('L') == 38
+
+    assert part1(RUCKSACKS) == 157
+    assert part2(RUCKSACKS) == 70
+
+    assert mask_priority(mask('L')) == 38
+    assert part1_masks(RUCKSACKS) == 157
+    assert part2_masks(RUCKSACKS) == 70
+    assert group_mask(RUCKSACKS) == 0
+
+    RUCKSACK_MASKS, COMPARTMENT_MASKS = parse_masks(RAW)
+    assert part1_vectorised(COMPARTMENT_MASKS) == 157
+    assert part2_vectorised(RUCKSACK_MASKS) == 70
+
+    rucksacks = parse(open('day03.txt').read())
+
+    print(part1(rucksacks))
+    print(part2(rucksacks))
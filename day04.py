@@ -1,5 +1,10 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Iterable, Iterator, Tuple
+
+import numpy as np
+
+import loader
 
 @dataclass
 class Range:
@@ -43,6 +48,159 @@ def count_overlapping_pairs(pairs: list[Pair]) -> int:
         for p1, p2 in pairs
     )
 
+parse = make_pairs
+
+def part1(pairs: list[Pair]) -> int:
+    return count_containing_pairs(pairs)
+
+def part2(pairs: list[Pair]) -> int:
+    return count_overlapping_pairs(pairs)
+
+
+### Columnar, every pair as a row of lo1, hi1, lo2, hi2
+
+SEPARATORS = bytes.maketrans(b',-\r\n', b'    ')
+
+def parse_columnar(raw: loader.Source) -> np.ndarray:
+    if isinstance(raw, str):
+        raw = raw.encode()
+    numbers = np.fromstring(bytes(raw).translate(SEPARATORS), dtype=np.int64, sep=' ')
+    if len(numbers) % 4:
+        raise ValueError('expected four numbers per line')
+    return numbers.reshape(-1, 4)
+
+def count_containing_columnar(pairs: np.ndarray) -> int:
+    lo1, hi1, lo2, hi2 = pairs.T
+    return int((((lo1 <= lo2) & (hi1 >= hi2)) | ((lo2 <= lo1) & (hi2 >= hi1))).sum())
+
+def count_overlapping_columnar(pairs: np.ndarray) -> int:
+    lo1, hi1, lo2, hi2 = pairs.T
+    return int((np.maximum(lo1, lo2) <= np.minimum(hi1, hi2)).sum())
+
+
+### Queries against every range at once, not just within a pair
+
+# bounds for "hi can be anything"
+HI_MIN = int(np.iinfo(np.int64).min)
+HI_MAX = int(np.iinfo(np.int64).max)
+
+def hi_dtype(his: list[int]) -> type:
+    # half the memory, if every hi (and the padding) fits
+    small = np.iinfo(np.int32)
+    return np.int32 if all(small.min <= hi < small.max for hi in his) else np.int64
+
+class RangeIndex:
+    """
+    The ranges sorted by lo, with a merge sort tree over their his, so that
+    "lo in some interval and hi in some other interval" is O(log^2 n) to
+    count and O(log^2 n + k) to list (a bisect in each of O(log n) nodes),
+    rather than O(log n + k). Counting overlaps alone is O(log n).
+
+    The tree is stored a level at a time: level L is one NumPy array of
+    every hi (int32 where they fit), sorted within each block of 2 ** L
+    ranges, plus the int32 positions (in lo order) they came from, so it's
+    O(n log n) small ints but no Python objects.
+    """
+    def __init__(self, ranges: Iterable[Range]) -> None:
+        self.ranges = sorted(ranges, key=lambda r: (r.lo, r.hi))
+        self.los = [r.lo for r in self.ranges]
+        self.his = sorted(r.hi for r in self.ranges)
+
+        # pad to a power of two, with his that sort last in every block
+        n = len(self.ranges)
+        self.size = 1 << max(n - 1, 0).bit_length()
+        dtype = hi_dtype(self.his)
+        self.hi_bounds = int(np.iinfo(dtype).min), int(np.iinfo(dtype).max)
+        his = np.full(self.size, self.hi_bounds[1], dtype=dtype)
+        his[:n] = [r.hi for r in self.ranges]
+
+        self.level_his: list[np.ndarray] = []
+        self.level_positions: list[np.ndarray] = []
+        block = 1
+        while block <= self.size:
+            order = np.argsort(his.reshape(-1, block), axis=1, kind='stable')
+            order += np.arange(0, self.size, block)[:, None]
+            positions = order.ravel().astype(np.int32)
+            self.level_his.append(his[positions])
+            self.level_positions.append(positions)
+            block *= 2
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def _blocks(self, start: int, stop: int) -> Iterator[tuple[int, slice]]:
+        """the blocks that together cover positions start..stop-1, as slices of their level"""
+        start += self.size
+        stop += self.size
+        level = 0
+        while start < stop:
+            # at this level, node i is block i - (size >> level)
+            first = self.size >> level
+            if start & 1:
+                yield level, slice((start - first) << level, (start - first + 1) << level)
+                start += 1
+            if stop & 1:
+                stop -= 1
+                yield level, slice((stop - first) << level, (stop - first + 1) << level)
+            start //= 2
+            stop //= 2
+            level += 1
+
+    def _clip(self, hi: int) -> int:
+        # searchsorted wants bounds that fit in the his' dtype
+        return min(max(hi, self.hi_bounds[0]), self.hi_bounds[1])
+
+    def _count(self, start: int, stop: int, hi_min: int, hi_max: int) -> int:
+        count = 0
+        for level, block in self._blocks(start, stop):
+            his = self.level_his[level][block]
+            count += int(np.searchsorted(his, self._clip(hi_max), 'right') - np.searchsorted(his, self._clip(hi_min), 'left'))
+        return count
+
+    def _find(self, start: int, stop: int, hi_min: int, hi_max: int) -> list[Range]:
+        found = []
+        for level, block in self._blocks(start, stop):
+            his = self.level_his[level][block]
+            lo = np.searchsorted(his, self._clip(hi_min), 'left')
+            hi = np.searchsorted(his, self._clip(hi_max), 'right')
+            matches = self.level_positions[level][block][lo:hi]
+            found.extend(matches.tolist())
+        return [self.ranges[i] for i in sorted(found)]
+
+    # the ranges that contain query: lo <= query.lo and hi >= query.hi
+
+    def _containing(self, query: Range) -> tuple[int, int, int, int]:
+        return 0, bisect_right(self.los, query.lo), query.hi, HI_MAX
+
+    def count_containing(self, query: Range) -> int:
+        return self._count(*self._containing(query))
+
+    def containing(self, query: Range) -> list[Range]:
+        return self._find(*self._containing(query))
+
+    # the ranges that query contains: query.lo <= lo and hi <= query.hi
+
+    def _contained(self, query: Range) -> tuple[int, int, int, int]:
+        return bisect_left(self.los, query.lo), bisect_right(self.los, query.hi), HI_MIN, query.hi
+
+    def count_contained(self, query: Range) -> int:
+        return self._count(*self._contained(query))
+
+    def contained(self, query: Range) -> list[Range]:
+        return self._find(*self._contained(query))
+
+    # the ranges that overlap query: lo <= query.hi and hi >= query.lo
+
+    def count_overlapping(self, query: Range) -> int:
+        # O(log n), since a range can't be both entirely above and entirely below
+        above = len(self) - bisect_right(self.los, query.hi)
+        below = bisect_left(self.his, query.lo)
+        return len(self) - above - below
+
+    def overlapping(self, query: Range) -> list[Range]:
+        return self._find(0, bisect_right(self.los, query.hi), query.lo, HI_MAX)
+
+
 RAW = """2-4,6-8
 2-3,4-5
 5-7,7-9
@@ -52,12 +210,29 @@ RAW = """2-4,6-8
 
 PAIRS = make_pairs(RAW)
 
-assert count_containing_pairs(PAIRS) == 2
-assert count_overlapping_pairs(PAIRS) == 4
 
-with open('day04.txt') as f:
-    raw = f.read()
-pairs = make_pairs(raw)
+if __name__ == "__main__":
+    assert count_containing_pairs(PAIRS) == 2
+    assert count_overlapping_pairs(PAIRS) == 4
+
+    COLUMNS = parse_columnar(RAW)
+    assert COLUMNS.shape == (6, 4)
+    assert count_containing_columnar(COLUMNS) == 2
+    assert count_overlapping_columnar(COLUMNS) == 4
+
+    RANGES = [r for pair in PAIRS for r in pair]
+    INDEX = RangeIndex(RANGES)
+    for query in RANGES + [Range(1, 9), Range(5, 5), Range(10, 12)]:
+        assert INDEX.containing(query) == sorted((r for r in RANGES if r.contains(query)), key=lambda r: (r.lo, r.hi))
+        assert INDEX.contained(query) == sorted((r for r in RANGES if query.contains(r)), key=lambda r: (r.lo, r.hi))
+        assert INDEX.overlapping(query) == sorted((r for r in RANGES if r.overlap(query)), key=lambda r: (r.lo, r.hi))
+        assert INDEX.count_containing(query) == len(INDEX.containing(query))
+        assert INDEX.count_contained(query) == len(INDEX.contained(query))
+        assert INDEX.count_overlapping(query) == len(INDEX.overlapping(query))
+
+    with open('day04.txt') as f:
+        raw = f.read()
+    pairs = parse(raw)
 
-print(count_containing_pairs(pairs))
-print(count_overlapping_pairs(pairs))
\ No newline at end of file
+    print(part1(pairs))
+    print(part2(pairs))
@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from typing import Iterator
+import random
 import re
 import copy
 
@@ -75,26 +77,195 @@ def get_problem(raw: str) -> Problem:
     moves = get_moves(raw_moves)
     return Problem(stacks, moves)
 
-PROBLEM = get_problem(RAW)
-PROBLEM.run()
 
-assert tops(PROBLEM.stacks) == "CMZ"
+### Ropes, so moving k crates doesn't cost O(k)
 
-PROBLEM = get_problem(RAW)
-PROBLEM.run(model=9001)
+class Rope:
+    """
+    A stack of crates as a randomized binary tree, bottom crate leftmost,
+    with a lazy flag for "this subtree is reversed". Splitting off the top k
+    crates, reversing them and joining them onto another stack are all
+    O(log n), however many crates move.
+    """
+    __slots__ = ('crate', 'left', 'right', 'size', 'flipped')
 
-assert tops(PROBLEM.stacks) == "MCD"
+    def __init__(self, crate: str, left: 'Rope | None' = None, right: 'Rope | None' = None) -> None:
+        self.crate = crate
+        self.left = left
+        self.right = right
+        self.size = 1 + size(left) + size(right)
+        self.flipped = False
 
-with open('day05.txt') as f:
-    raw = f.read()
+    def push(self) -> None:
+        if self.flipped:
+            self.left, self.right = self.right, self.left
+            for child in (self.left, self.right):
+                if child is not None:
+                    child.flipped = not child.flipped
+            self.flipped = False
 
-problem = get_problem(raw)
-problem.run()
+    def update(self) -> None:
+        self.size = 1 + size(self.left) + size(self.right)
 
-print(tops(problem.stacks))
+    def __iter__(self) -> Iterator[str]:
+        self.push()
+        if self.left is not None:
+            yield from self.left
+        yield self.crate
+        if self.right is not None:
+            yield from self.right
 
+    def top(self) -> str:
+        node = self
+        node.push()
+        while node.right is not None:
+            node = node.right
+            node.push()
+        return node.crate
 
-problem = get_problem(raw)
-problem.run(model=9001)
 
-print(tops(problem.stacks))
\ No newline at end of file
+def size(rope: Rope | None) -> int:
+    return 0 if rope is None else rope.size
+
+
+def build(crates: list[str]) -> Rope | None:
+    if not crates:
+        return None
+    mid = len(crates) // 2
+    return Rope(crates[mid], build(crates[:mid]), build(crates[mid + 1:]))
+
+
+def join(a: Rope | None, b: Rope | None) -> Rope | None:
+    """a with b on top of it"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    # picking the root in proportion to size keeps the tree random
+    if random.randrange(a.size + b.size) < a.size:
+        a.push()
+        a.right = join(a.right, b)
+        a.update()
+        return a
+    else:
+        b.push()
+        b.left = join(a, b.left)
+        b.update()
+        return b
+
+
+def split(rope: Rope | None, k: int) -> tuple[Rope | None, Rope | None]:
+    """the bottom k crates, and the rest"""
+    if rope is None:
+        return None, None
+    rope.push()
+    if k <= size(rope.left):
+        bottom, rope.left = split(rope.left, k)
+        rope.update()
+        return bottom, rope
+    else:
+        rope.right, top = split(rope.right, k - size(rope.left) - 1)
+        rope.update()
+        return rope, top
+
+
+class RopeStacks:
+    def __init__(self, stacks: Stacks) -> None:
+        self.ropes = {c: build(stack) for c, stack in stacks.items()}
+
+    def move(self, move: Move, model: int = 9000) -> None:
+        # check everything before splitting, so a bad move leaves the stacks alone
+        if model not in (9000, 9001):
+            raise ValueError("Invalid model")
+        source = self.ropes[move.from_]
+        if move.quantity > size(source):
+            raise ValueError(f"Not enough crates for {move}")
+        rest, crates = split(source, size(source) - move.quantity)
+        if model == 9000 and crates is not None:
+            # one at a time, so they land in reverse order
+            crates.flipped = not crates.flipped
+        self.ropes[move.from_] = rest
+        self.ropes[move.to] = join(self.ropes[move.to], crates)
+
+    def run(self, moves: list[Move], model: int = 9000) -> None:
+        for move in moves:
+            self.move(move, model)
+
+    def stacks(self) -> Stacks:
+        return {c: list(rope or []) for c, rope in self.ropes.items()}
+
+    def tops(self) -> str:
+        return ''.join(rope.top() for rope in self.ropes.values() if rope is not None)
+
+
+### Only the tops, by working backwards
+
+def tops_only(problem: Problem, model: int = 9000) -> str:
+    """
+    the same as tops() after running, but only following the crates that
+    end up on top back through the moves, so it's O(stacks * moves) no
+    matter how many crates there are
+    """
+    if model not in (9000, 9001):
+        raise ValueError("Invalid model")
+
+    # stacks that end up empty don't have a top
+    heights = {c: len(stack) for c, stack in problem.stacks.items()}
+    for move in problem.moves:
+        heights[move.from_] -= move.quantity
+        heights[move.to] += move.quantity
+
+    # (stack, depth from the top) of each crate that finishes on top
+    positions = {c: (c, 0) for c, height in heights.items() if height > 0}
+
+    for move in reversed(problem.moves):
+        for c, (stack, depth) in positions.items():
+            if stack == move.to:
+                if depth < move.quantity:
+                    # it was just moved here, reversed by the 9000
+                    if model == 9000:
+                        depth = move.quantity - 1 - depth
+                    stack = move.from_
+                else:
+                    depth -= move.quantity
+            elif stack == move.from_:
+                depth += move.quantity
+            positions[c] = (stack, depth)
+
+    return ''.join(problem.stacks[stack][-1 - depth] for stack, depth in positions.values())
+
+
+parse = get_problem
+
+def part1(problem: Problem) -> str:
+    # running moves the crates around, so work on a copy
+    problem = copy.deepcopy(problem)
+    problem.run()
+    return tops(problem.stacks)
+
+def part2(problem: Problem) -> str:
+    problem = copy.deepcopy(problem)
+    problem.run(model=9001)
+    return tops(problem.stacks)
+
+
+if __name__ == "__main__":
+    PROBLEM = get_problem(RAW)
+    assert part1(PROBLEM) == "CMZ"
+    assert part2(PROBLEM) == "MCD"
+
+    for model in (9000, 9001):
+        ropes = RopeStacks(PROBLEM.stacks)
+        ropes.run(PROBLEM.moves, model)
+        problem = copy.deepcopy(PROBLEM)
+        problem.run(model)
+        assert ropes.stacks() == problem.stacks
+        assert tops_only(PROBLEM, model) == ropes.tops() == tops(problem.stacks)
+
+    with open('day05.txt') as f:
+        raw = f.read()
+
+    problem = parse(raw)
+
+    print(part1(problem))
+    print(part2(problem))
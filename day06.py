@@ -1,26 +1,109 @@
-from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import IO, Iterable, Iterator
 
 RAW = "mjqjpqmgbljsphdztnvjfqwrcgsmlb"
 
+CHUNK_SIZE = 1 << 16
 
-def find_start(packet: str, size: int = 4) -> int:
-    q = deque()
+Signal = str | bytes | IO[str] | IO[bytes]
 
-    for i, c in enumerate(packet):
-        q.append(c)
-        if len(q) > size:
-            q.popleft()
 
-        if len(set(q)) == size:
-            return i + 1
+def chunks(signal: Signal) -> Iterator[str | bytes]:
+    # a stream gets read a bit at a time instead of all at once
+    if isinstance(signal, (str, bytes)):
+        yield signal
+        return
+    while chunk := signal.read(CHUNK_SIZE):
+        yield chunk
+
+
+def distinct_runs(signal: Signal) -> Iterator[int]:
+    """
+    for each character, how many characters up to and including it are all
+    different, which is O(1) per character using where each was last seen
+    """
+    last_seen: dict[str | int, int] = {}
+    run_start = 0
+    i = 0
+    for chunk in chunks(signal):
+        for c in chunk:
+            previous = last_seen.get(c, -1)
+            if previous >= run_start:
+                run_start = previous + 1
+            last_seen[c] = i
+            i += 1
+            yield i - run_start
+
+
+def find_markers(signal: Signal, size: int = 4) -> Iterator[int]:
+    """the number of characters read at the end of every marker"""
+    for i, run in enumerate(distinct_runs(signal)):
+        if run >= size:
+            yield i + 1
+
+
+def find_start(packet: Signal, size: int = 4) -> int:
+    for marker in find_markers(packet, size):
+        return marker
 
     raise ValueError("No start found")
 
-assert find_start(RAW) == 7
-assert find_start(RAW, 14) == 19
 
-with open('day06.txt') as f:
-    raw = f.read()
+### Several window sizes, and lots of streams, at once
+
+def first_markers(signal: Signal, sizes: Iterable[int] = (4, 14)) -> dict[int, int | None]:
+    """the first marker for each size (None if there isn't one), in one pass"""
+    markers: dict[int, int | None] = {size: None for size in sizes}
+    waiting = sorted(markers)
+
+    for i, run in enumerate(distinct_runs(signal)):
+        # a run long enough for one size is long enough for all the smaller ones
+        while waiting and run >= waiting[0]:
+            markers[waiting.pop(0)] = i + 1
+        if not waiting:
+            break
+
+    return markers
+
+
+def scan_file(path: Path, sizes: Iterable[int] = (4, 14)) -> dict[int, int | None]:
+    with open(path, 'rb') as f:
+        return first_markers(f, sizes)
+
+
+def scan_files(
+    paths: list[Path],
+    sizes: Iterable[int] = (4, 14),
+    max_workers: int | None = None,
+) -> dict[Path, dict[int, int | None]]:
+    """first_markers for each file, across a process pool"""
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(partial(scan_file, sizes=tuple(sizes)), paths)
+        return dict(zip(paths, results))
+
+
+def parse(raw: str) -> str:
+    return raw.strip()
+
+def part1(packet: str) -> int:
+    return find_start(packet)
+
+def part2(packet: str) -> int:
+    return find_start(packet, 14)
+
+
+if __name__ == "__main__":
+    assert find_start(RAW) == 7
+    assert find_start(RAW, 14) == 19
+    assert find_start(RAW.encode(), 14) == 19
+    assert list(find_markers("abcabd", 3)) == [3, 4, 5, 6]
+    assert list(find_markers("aabb", 2)) == [3]
+    assert first_markers(RAW, [14, 4, 100]) == {4: 7, 14: 19, 100: None}
+
+    with open('day06.txt') as f:
+        packet = parse(f.read())
 
-print(find_start(raw))
-print(find_start(raw, 14))
\ No newline at end of file
+    print(part1(packet))
+    print(part2(packet))
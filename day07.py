@@ -1,5 +1,8 @@
+from array import array
 from dataclasses import dataclass
-from typing import Union, Iterator
+from typing import Iterable, Union, Iterator
+
+import loader
 
 @dataclass
 class File:
@@ -14,50 +17,53 @@ class Directory:
     size: int = -1
 
 
+def walk(root: Directory) -> list[Directory]:
+    """every directory from root down, each one before its subdirectories"""
+    # a stack instead of recursion, since trees can be deeper than the recursion limit
+    dirs = []
+    stack = [root]
+    while stack:
+        dir = stack.pop()
+        dirs.append(dir)
+        stack.extend(file for file in reversed(dir.files.values()) if isinstance(file, Directory))
+    return dirs
+
 def compute_sizes(dir: Directory) -> int:
-    dir_size = 0
-    for file in dir.files.values():
-        match file:
-            case File(_, size):
-                dir_size += size
-            case Directory():
-                dir_size += compute_sizes(file)
-    dir.size = dir_size
-
-    return dir_size
-
-def learn_filesystem(raw: str) -> Directory:
+    # backwards, so every subdirectory's size is known before its parent's
+    for subdir in reversed(walk(dir)):
+        subdir.size = sum(file.size for file in subdir.files.values())
+
+    return dir.size
+
+def learn_filesystem(raw: loader.Source) -> Directory:
     """Parse the filesystem from the raw string and return the root directory"""
     root = Directory([], {})
     pwd: Directory = root
 
-    commands = [x.strip() for x in raw.split("$ ") if x.strip()]
-
-    for command in commands:
-        lines = command.split("\n")
-
-        match lines:
-            case ["ls", *rest]:
-                for listing in rest:
-                    match listing.split():
-                        case ["dir", dirname]:
-                            if "dirname" not in pwd.files:
-                                pwd.files[dirname] = Directory(pwd.path + [dirname], {}, pwd)
-                        case [size, filename]:
-                            pwd.files[filename] = File(filename, int(size))
-            case [cd]:
-                match cd.split():
-                    case ["cd", "/"]:
-                        pwd = root
-                    case ["cd", ".."]:
-                        pwd = pwd.parent if pwd.parent else pwd
-                    case ["cd", dirname]:
-                        if dirname in pwd.files:
-                            newdir = pwd.files[dirname]
-                            assert isinstance(newdir, Directory)
-                            pwd = newdir
-                        else:
-                            pwd.files[dirname] = Directory(pwd.path + [dirname], {}, pwd)
+    for line in loader.iter_lines(raw):
+        line = line.rstrip("\r")
+
+        # only a line that starts with "$ " is a command, anywhere else it's a name
+        if line.startswith("$ "):
+            match line[2:].split(" ", 1):
+                case ["cd", "/"]:
+                    pwd = root
+                case ["cd", ".."]:
+                    pwd = pwd.parent if pwd.parent else pwd
+                case ["cd", dirname]:
+                    if dirname not in pwd.files:
+                        pwd.files[dirname] = Directory(pwd.path + [dirname], {}, pwd)
+                    newdir = pwd.files[dirname]
+                    assert isinstance(newdir, Directory)
+                    pwd = newdir
+        else:
+            # everything else is ls output
+            match line.split(" ", 1):
+                case ["dir", dirname]:
+                    if dirname not in pwd.files:
+                        pwd.files[dirname] = Directory(pwd.path + [dirname], {}, pwd)
+                case [size, filename]:
+                    pwd.files[filename] = File(filename, int(size))
 
     compute_sizes(root)
     return root
@@ -90,43 +96,175 @@ FS = learn_filesystem(RAW)
 
 
 def all_directories_below(root: Directory, size: int = 100_000) -> Iterator[Directory]:
-    if root.size <= size:
-        yield root
-    for file in root.files.values():
-        match file:
-            case Directory():
-                yield from all_directories_below(file, size)
-            case _:
-                pass
-
-assert sum(dir.size for dir in all_directories_below(FS)) == 95437
-
-with open('day07.txt') as f:
-    fs = learn_filesystem(f.read())
-
-print(sum(dir.size for dir in all_directories_below(fs)))
+    return (dir for dir in walk(root) if dir.size <= size)
 
 TOTAL_DISK_SIZE = 70_000_000
 NEED_UNUSED_SIZE = 30_000_000
 MAX_SIZE = TOTAL_DISK_SIZE - NEED_UNUSED_SIZE  # 40_000_000
 
-USED_SIZE = FS.size 
-NEED_TO_FREE = USED_SIZE - MAX_SIZE
-assert NEED_TO_FREE == 8_381_165
-
 def candidate_directories(root: Directory, need_to_free: int) -> Iterator[Directory]:
-    for file in root.files.values():
-        match file:
-            case Directory(_, _, _, size):
-                if size >= need_to_free:
-                    yield file
-                yield from candidate_directories(file, need_to_free)
-            case _:
-                pass
+    # not including root itself
+    return (dir for dir in walk(root)[1:] if dir.size >= need_to_free)
+
+def directory_sizes(root: Directory) -> list[int]:
+    """the size of every directory, root first, in the same order as walk"""
+    return [dir.size for dir in walk(root)]
+
+
+### Compact, for transcripts with millions of entries
+
+class CompactFilesystem:
+    """
+    Directories are ints (root is 0) indexing into parallel arrays, each
+    different name is stored once and referred to by its index in names, and
+    files aren't kept at all, just added to the size of their directory and
+    of every directory above it.
+    """
+    def __init__(self) -> None:
+        self.names: list[str] = ['']
+        self.name_ids: dict[str, int] = {'': 0}
+        self.parent = array('q', [-1])
+        self.first_child = array('q', [-1])
+        self.next_sibling = array('q', [-1])
+        self.name = array('q', [0])
+        self.size = array('q', [0])
+        # whether a directory's ls has been counted already
+        self.listed = bytearray(1)
+        # (parent id << 32 | name id) -> id, as one int rather than a tuple
+        self.children: dict[int, int] = {}
+
+        # where feed() is up to in the transcript
+        self.pwd = 0
+        self.counting = False
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def child(self, dir: int, dirname: str) -> int:
+        """the id of dir/dirname, creating it if needed"""
+        name_id = self.name_ids.get(dirname)
+        if name_id is None:
+            name_id = self.name_ids[dirname] = len(self.names)
+            self.names.append(dirname)
+
+        key = dir << 32 | name_id
+        if key not in self.children:
+            id = len(self)
+            self.children[key] = id
+            self.parent.append(dir)
+            self.first_child.append(-1)
+            # prepend, so children are newest first
+            self.next_sibling.append(self.first_child[dir])
+            self.first_child[dir] = id
+            self.name.append(name_id)
+            self.size.append(0)
+            self.listed.append(0)
+        return self.children[key]
+
+    def path(self, dir: int) -> list[str]:
+        path = []
+        while dir > 0:
+            path.append(self.names[self.name[dir]])
+            dir = self.parent[dir]
+        return path[::-1]
+
+    def walk(self) -> Iterator[int]:
+        """every directory, each one before its subdirectories, same order as walk()"""
+        stack = [0]
+        while stack:
+            dir = stack.pop()
+            yield dir
+            # newest first onto the stack, so oldest first off it
+            child = self.first_child[dir]
+            while child != -1:
+                stack.append(child)
+                child = self.next_sibling[child]
+
+    def all_directories_below(self, size: int = 100_000) -> Iterator[int]:
+        return (dir for dir in self.walk() if self.size[dir] <= size)
+
+    def candidate_directories(self, need_to_free: int) -> Iterator[int]:
+        return (dir for dir in self.walk() if dir and self.size[dir] >= need_to_free)
+
+    def add_file(self, dir: int, size: int) -> None:
+        # every directory's size stays up to date, so it can be asked for at any time
+        while dir != -1:
+            self.size[dir] += size
+            dir = self.parent[dir]
+
+    def feed(self, line: str) -> None:
+        """take the next line of a transcript, which could still be being written"""
+        line = line.rstrip("\r\n")
+
+        # only a line that starts with "$ " is a command, anywhere else it's a name
+        if line.startswith("$ "):
+            command = line[2:]
+            self.counting = False
+            if command == "ls":
+                # listing the same directory twice mustn't count it twice
+                self.counting = not self.listed[self.pwd]
+                self.listed[self.pwd] = 1
+            elif command == "cd /":
+                self.pwd = 0
+            elif command == "cd ..":
+                self.pwd = max(self.parent[self.pwd], 0)
+            elif command.startswith("cd "):
+                self.pwd = self.child(self.pwd, command[3:])
+        elif line.startswith("dir "):
+            self.child(self.pwd, line[4:])
+        elif line and self.counting:
+            size, _ = line.split(" ", 1)
+            self.add_file(self.pwd, int(size))
+
+    def feed_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.feed(line)
+
+    @staticmethod
+    def parse(raw: loader.Source) -> 'CompactFilesystem':
+        fs = CompactFilesystem()
+        fs.feed_lines(loader.iter_lines(raw))
+        return fs
+
+
+parse = learn_filesystem
+
+def part1(fs: Directory) -> int:
+    return sum(size for size in directory_sizes(fs) if size <= 100_000)
+
+def part2(fs: Directory) -> int:
+    root_size, *sizes = directory_sizes(fs)
+    need_to_free = root_size - MAX_SIZE
+    return min(size for size in sizes if size >= need_to_free)
+
+
+if __name__ == "__main__":
+    assert part1(FS) == 95437
+    assert sum(dir.size for dir in all_directories_below(FS)) == 95437
+    assert [dir.path for dir in walk(FS)] == [[], ['a'], ['a', 'e'], ['d']]
+
+    assert FS.size - MAX_SIZE == 8_381_165
+
+    assert part2(FS) == 24_933_642
+    assert min(dir.size for dir in candidate_directories(FS, 8_381_165)) == 24_933_642
+
+    COMPACT = CompactFilesystem.parse(RAW)
+    assert [COMPACT.path(dir) for dir in COMPACT.walk()] == [dir.path for dir in walk(FS)]
+    assert [COMPACT.size[dir] for dir in COMPACT.walk()] == directory_sizes(FS)
+    assert [COMPACT.path(dir) for dir in COMPACT.all_directories_below()] == [dir.path for dir in all_directories_below(FS)]
+    assert [COMPACT.path(dir) for dir in COMPACT.candidate_directories(8_381_165)] == [dir.path for dir in candidate_directories(FS, 8_381_165)]
 
-assert min(dir.size for dir in candidate_directories(FS, NEED_TO_FREE)) == 24_933_642
+    # sizes are right part way through, and "$ " in a name is just a name
+    LIVE = CompactFilesystem()
+    LIVE.feed_lines(RAW.splitlines()[:12])
+    assert LIVE.size[0] == 14848514 + 8504156 + 29116 + 2557 + 62596
+    LIVE.feed_lines(["dir $ cd /", "$ cd $ cd /", "$ ls", "100 $ ls"])
+    assert LIVE.path(LIVE.pwd) == ["a", "$ cd /"] and LIVE.size[1] == 29116 + 2557 + 62596 + 100
+    DOLLARS = learn_filesystem("\n".join(RAW.splitlines()[:12] + ["dir $ cd /", "$ cd $ cd /", "$ ls", "100 $ ls"]))
+    assert [dir.size for dir in walk(DOLLARS)] == [LIVE.size[dir] for dir in LIVE.walk()]
 
-used_size = fs.size 
-need_to_free = used_size - MAX_SIZE
+    with open('day07.txt') as f:
+        fs = parse(f.read())
 
-print(min(dir.size for dir in candidate_directories(fs, need_to_free)))
\ No newline at end of file
+    print(part1(fs))
+    print(part2(fs))
@@ -1,3 +1,10 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import loader
+
 RAW = """30373
 25512
 65332
@@ -61,12 +68,6 @@ def count_visibilities(trees: list[list[int]]) -> int:
     vis = visibilities(trees)
     return sum(bool(x) for row in vis for x in row)
 
-assert count_visibilities(TREES) == 21
-
-with open('day08.txt') as f:
-    trees = parse(f.read())
-    print(count_visibilities(trees))
-
 def viewing_distance(trees: list[list[int]], i: int, j: int) -> list[int]:
     original_i, original_j = i, j 
     h = trees[i][j]
@@ -146,6 +147,263 @@ def best_location(trees: list[list[int]]) -> int:
                )
 
 
-assert best_location(TREES) == 8
+### NumPy, for when the grid is huge
+
+def grid_shape(raw: loader.Source) -> tuple[int, int]:
+    """(rows, columns), from where the first newline is and the length"""
+    width = raw.find(b'\n' if not isinstance(raw, str) else '\n')
+    if width == -1:
+        width = len(raw)
+    if width == 0:
+        return 0, 0
+    rows, rest = divmod(len(raw), width + 1)
+    if rest not in (0, width):
+        raise ValueError('rows have different lengths')
+    # the last row might not have a newline after it
+    return rows + bool(rest), width
+
+def parse_grid(raw: loader.Source, start: int = 0, stop: int | None = None) -> np.ndarray:
+    """
+    rows start..stop-1 of the grid (all of it by default) as a 2-D uint8
+    array of the digits' ASCII codes, which compare just like the heights do,
+    so it can be a view of only those rows' bytes with no copy
+    """
+    if isinstance(raw, str):
+        raw = raw.encode()
+    num_rows, width = grid_shape(raw)
+    stop = num_rows if stop is None else min(stop, num_rows)
+    start = min(start, stop)
+
+    stride = width + 1
+    offset = start * stride
+    count = min(stop * stride, len(raw)) - offset
+    if count <= 0:
+        return np.zeros((0, width), dtype=np.uint8)
+
+    buf = np.frombuffer(raw, dtype=np.uint8, count=count, offset=offset)
+    if count % stride:
+        # no newline after the last row, so only that row's strip gets copied
+        buf = np.append(buf, np.uint8(ord('\n')))
+    return buf.reshape(-1, stride)[:, :width]
+
+def visible_from_left(grid: np.ndarray) -> np.ndarray:
+    # a tree is visible if it's taller than the tallest tree before it
+    tallest = np.maximum.accumulate(grid, axis=1)
+    visible = np.ones(grid.shape, dtype=bool)
+    visible[:, 1:] = grid[:, 1:] > tallest[:, :-1]
+    return visible
+
+def visible_mask(grid: np.ndarray) -> np.ndarray:
+    return (
+        visible_from_left(grid)
+        | visible_from_left(grid[:, ::-1])[:, ::-1]
+        | visible_from_left(grid.T).T
+        | visible_from_left(grid[::-1].T).T[::-1]
+    )
+
+def count_visible(grid: np.ndarray) -> int:
+    return int(visible_mask(grid).sum())
+
+def viewing_distances(heights: list[int]) -> list[int]:
+    """
+    how far each tree can see back towards the start of the line, with a
+    stack of the trees that could still block the view, so O(n) in all
+    """
+    blockers: list[int] = []
+    res = []
+    for i, h in enumerate(heights):
+        # anything shorter is hidden behind this tree from now on
+        while blockers and heights[blockers[-1]] < h:
+            blockers.pop()
+        res.append(i - blockers[-1] if blockers else i)
+        blockers.append(i)
+    return res
+
+def scenic_scores(trees: list[list[int]] | np.ndarray) -> np.ndarray:
+    """the scenic score of every tree, in O(rows * columns)"""
+    grid = np.asarray(trees)
+    rows = grid.tolist()
+    cols = grid.T.tolist()
+
+    left = np.array([viewing_distances(row) for row in rows], dtype=np.int64)
+    right = np.array([viewing_distances(row[::-1])[::-1] for row in rows], dtype=np.int64)
+    up = np.array([viewing_distances(col) for col in cols], dtype=np.int64).T
+    down = np.array([viewing_distances(col[::-1])[::-1] for col in cols], dtype=np.int64).T
+
+    return left * right * up * down
+
+def top_locations(scores: np.ndarray, k: int = 1) -> list[tuple[int, int, int]]:
+    """(row, column, score) for the k best trees, best first"""
+    k = min(k, scores.size)
+    if k <= 0:
+        return []
+    flat = scores.ravel()
+    best = np.argpartition(flat, flat.size - k)[-k:]
+    best = best[np.argsort(-flat[best], kind='stable')]
+    return [(*map(int, np.unravel_index(i, scores.shape)), int(flat[i])) for i in best]
+
+
+### Strips of rows across a process pool, for grids too big for one process
+
+# about how many trees each worker gets at a time, whatever the grid's size
+STRIP_CELLS = 1 << 20
+
+# for "no tree this tall in the strip"
+NOWHERE = np.iinfo(np.int32).max
+
+def load_strip(path: Path, start: int, stop: int) -> np.ndarray:
+    """rows start..stop-1 as heights, only reading those rows out of the map"""
+    with loader.mapped(path) as buf:
+        rows = parse_grid(buf, start, stop)
+        strip = rows - np.uint8(ord('0'))
+        del rows  # so the map can close
+    return strip
+
+def summarise_strip(path: Path, start: int, stop: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    per column: the tallest tree in the strip, and the last and first row
+    (-1 / NOWHERE if none) with a tree at least each height tall
+    """
+    strip = load_strip(path, start, stop)
+    last = np.empty((10, strip.shape[1]), dtype=np.int32)
+    first = np.empty((10, strip.shape[1]), dtype=np.int32)
+    for h in range(10):
+        at_least = strip >= h
+        found = at_least.any(axis=0)
+        last[h] = np.where(found, stop - 1 - np.argmax(at_least[::-1], axis=0), -1)
+        first[h] = np.where(found, start + np.argmax(at_least, axis=0), NOWHERE)
+    return strip.max(axis=0).astype(np.int16), last, first
+
+def distances_from_left(heights: np.ndarray, offset: int, nearest: np.ndarray) -> np.ndarray:
+    """
+    how far each tree can see towards the first column, where the columns are
+    at positions offset, offset + 1, ... and nearest[h] is the position of the
+    nearest tree at least h tall before them in each row (or 0, the edge)
+
+    the same as viewing_distances' stack, but with only ten heights it can
+    be a table of the nearest tree of each height, worked out a height at a time
+    """
+    positions = offset + np.arange(heights.shape[1], dtype=np.int32)
+    res = np.zeros(heights.shape, dtype=np.int32)
+    for h in range(10):
+        # the last tree at least h tall, up to and including each one,
+        # then shifted along one to be strictly before it
+        last = np.maximum.accumulate(np.where(heights >= h, positions, np.int32(-1)), axis=1)
+        last = np.maximum(last, nearest[h][:, None])
+        before = np.concatenate((nearest[h][:, None], last[:, :-1]), axis=1)
+        here = heights == h
+        res[here] = (positions - before)[here]
+    return res
 
-print(best_location(trees))
\ No newline at end of file
+def solve_strip(
+    path: Path,
+    start: int,
+    stop: int,
+    num_rows: int,
+    above: tuple[np.ndarray, np.ndarray],
+    below: tuple[np.ndarray, np.ndarray],
+    k: int,
+) -> tuple[int, list[tuple[int, int, int]]]:
+    """
+    the number of visible trees, and the k best scenic scores, in the strip,
+    given the tallest tree and the nearest row at least each height tall
+    above and below it in every column
+    """
+    strip = load_strip(path, start, stop)
+    tallest_above, last_above = above
+    tallest_below, first_below = below
+
+    # left and right only need the strip's own rows
+    visible = visible_from_left(strip) | visible_from_left(strip[:, ::-1])[:, ::-1]
+
+    # up and down carry on from the strips either side
+    running = np.maximum(np.maximum.accumulate(strip, axis=0), tallest_above)
+    visible |= strip > np.vstack((tallest_above, running[:-1]))
+    running = np.maximum(np.maximum.accumulate(strip[::-1], axis=0), tallest_below)
+    visible[::-1] |= strip[::-1] > np.vstack((tallest_below, running[:-1]))
+    num_visible = int(visible.sum())
+    del visible, running
+
+    edge = np.zeros((10, len(strip)), dtype=np.int32)
+    scores = distances_from_left(strip, 0, edge).astype(np.int64)
+    scores *= distances_from_left(strip[:, ::-1], 0, edge)[:, ::-1]
+    scores *= distances_from_left(strip.T, start, last_above).T
+    # going up the rows, so count positions from the bottom
+    scores *= distances_from_left(strip[::-1].T, num_rows - stop, num_rows - 1 - first_below).T[::-1]
+
+    best = [(r + start, c, score) for r, c, score in top_locations(scores, k)]
+    return num_visible, best
+
+def solve_tiled(
+    path: Path,
+    max_workers: int | None = None,
+    k: int = 1,
+    strip_cells: int = STRIP_CELLS,
+) -> tuple[int, list[tuple[int, int, int]]]:
+    """
+    count_visible and top_locations for the grid in the file at path, in
+    strips of about strip_cells trees across a process pool, so no process
+    ever holds more than a strip's worth, however big the grid
+    """
+    with loader.mapped(path) as buf:
+        num_rows, num_cols = grid_shape(buf)
+    if num_rows == 0:
+        return 0, []
+    rows_per_strip = max(1, strip_cells // num_cols)
+    strips = [(start, min(start + rows_per_strip, num_rows)) for start in range(0, num_rows, rows_per_strip)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        summaries = list(pool.map(summarise_strip, *zip(*((path, *strip) for strip in strips))))
+
+        # combine every strip's summary with those after it, then with those
+        # before it; the edges act like trees of every height, just out of sight
+        belows = []
+        tallest = np.full(num_cols, -1, dtype=np.int16)
+        nearest = np.full((10, num_cols), num_rows - 1, dtype=np.int32)
+        for tallest_in, _, first in reversed(summaries):
+            belows.append((tallest, nearest))
+            tallest = np.maximum(tallest, tallest_in)
+            nearest = np.minimum(nearest, first)
+        belows.reverse()
+
+        futures = []
+        tallest = np.full(num_cols, -1, dtype=np.int16)
+        nearest = np.zeros((10, num_cols), dtype=np.int32)
+        for (start, stop), below, (tallest_in, last, _) in zip(strips, belows, summaries):
+            futures.append(pool.submit(solve_strip, path, start, stop, num_rows, (tallest, nearest), below, k))
+            tallest = np.maximum(tallest, tallest_in)
+            nearest = np.maximum(nearest, last)
+        del summaries, belows
+        results = [future.result() for future in futures]
+
+    visible = sum(count for count, _ in results)
+    best = sorted((location for _, locations in results for location in locations), key=lambda x: -x[2])
+    return visible, best[:k]
+
+
+def part1(trees: list[list[int]]) -> int:
+    return count_visibilities(trees)
+
+def part2(trees: list[list[int]]) -> int:
+    return best_location(trees)
+
+
+if __name__ == "__main__":
+    assert count_visibilities(TREES) == 21
+    assert best_location(TREES) == 8
+
+    GRID = parse_grid(RAW)
+    assert (GRID - ord('0') == TREES).all()
+    assert count_visible(GRID) == 21
+
+    SCORES = scenic_scores(GRID)
+    assert SCORES.tolist() == [[product(viewing_distance(TREES, i, j)) for j in range(5)] for i in range(5)]
+    assert top_locations(SCORES) == [(3, 2, 8)]
+
+    with open('day08.txt') as f:
+        trees = parse(f.read())
+
+    print(part1(trees))
+    print(part2(trees))
+
+    assert solve_tiled(Path('day08.txt'), max_workers=2, strip_cells=1_000) == (part1(trees), [(52, 14, part2(trees))])
@@ -1,6 +1,9 @@
+from array import array
 from typing import NamedTuple
 from dataclasses import dataclass
 
+import loader
+
 RAW = """R 4
 U 4
 L 3
@@ -49,10 +52,10 @@ class Rope:
             self.tx += sgn(dx)
             self.ty += sgn(dy)
 
-    def run(self, instructions: str):
+    def run(self, instructions: loader.Source):
         visited = {(self.tx, self.ty)}
         # print(self)
-        for instruction in instructions.splitlines():
+        for instruction in loader.iter_lines(instructions):
             direction, distance = instruction.split()
             for _ in range(int(distance)):
                 self.move_head(direction)
@@ -60,15 +63,6 @@ class Rope:
                 # print(self)
         return len(visited)
 
-rope = Rope()
-assert rope.run(RAW) == 13
-
-with open('day09.txt') as f:
-    raw = f.read()
-
-rope = Rope()
-print(rope.run(raw))
-
 class LongRope:
     def __init__(self, n: int = 10):
         self.n = n
@@ -108,10 +102,10 @@ class LongRope:
 
         self.move_tail(i+1)
 
-    def run(self, instructions: str):
+    def run(self, instructions: loader.Source):
         visited = {(self.xs[-1], self.ys[-1])}
         # print(self)
-        for instruction in instructions.splitlines():
+        for instruction in loader.iter_lines(instructions):
             direction, distance = instruction.split()
             for _ in range(int(distance)):
                 self.move_head(direction)
@@ -119,8 +113,177 @@ class LongRope:
                 # print(self)
         return len(visited)
 
-long_rope = LongRope(2)
-assert long_rope.run(RAW) == 13
 
-long_rope = LongRope(10)
-print(long_rope.run(raw))
\ No newline at end of file
+### A straight line at a time, instead of a step at a time
+
+DIRECTIONS = {"U": (0, 1), "D": (0, -1), "L": (-1, 0), "R": (1, 0)}
+
+# a knot's moves during one instruction, as (dx, dy, how many times)
+Runs = list[tuple[int, int, int]]
+
+def follow(runs: Runs, ox: int, oy: int) -> Runs:
+    """
+    the moves of a knot that starts (ox, oy) behind a knot making these
+    moves, leaving out the steps where it stays still
+    """
+    res: Runs = []
+    for dx, dy, count in runs:
+        while count:
+            nx, ny = ox + dx, oy + dy
+            if abs(nx) <= 1 and abs(ny) <= 1:
+                sx, sy = 0, 0
+            else:
+                sx, sy = sgn(nx), sgn(ny)
+
+            if (sx, sy) == (dx, dy):
+                # following in lockstep, so the gap stays the same and it'll
+                # keep making the same step until this run ends
+                steps = count
+            else:
+                steps = 1
+                ox, oy = nx - sx, ny - sy
+            count -= steps
+
+            if (sx, sy) == (0, 0):
+                # a knot that's in reach of a still knot stays still too, so
+                # still steps can't affect anything further down the rope
+                continue
+            if res and res[-1][:2] == (sx, sy):
+                res[-1] = (sx, sy, res[-1][2] + steps)
+            else:
+                res.append((sx, sy, steps))
+    return res
+
+# cells are kept in 64 x 64 chunks, a bit each
+CHUNK_BITS = 6
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+class Visited:
+    """
+    A set of cells as a bitmap that only has chunks where something has
+    been visited, so it grows with the area covered instead of costing
+    a tuple and a set entry per cell.
+    """
+    def __init__(self):
+        self.chunks: dict[tuple[int, int], bytearray] = {}
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _locate(self, x: int, y: int) -> tuple[tuple[int, int], int, int]:
+        bit = ((x & CHUNK_MASK) << CHUNK_BITS) | (y & CHUNK_MASK)
+        return (x >> CHUNK_BITS, y >> CHUNK_BITS), bit >> 3, 1 << (bit & 7)
+
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        key, byte, mask = self._locate(*cell)
+        chunk = self.chunks.get(key)
+        return chunk is not None and bool(chunk[byte] & mask)
+
+    def add(self, x: int, y: int) -> None:
+        key, byte, mask = self._locate(x, y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = bytearray(1 << (2 * CHUNK_BITS - 3))
+        if not chunk[byte] & mask:
+            chunk[byte] |= mask
+            self.count += 1
+
+    def add_runs(self, x: int, y: int, runs: Runs) -> None:
+        """every cell moved through by a knot starting at (x, y)"""
+        for dx, dy, count in runs:
+            for _ in range(count):
+                x += dx
+                y += dy
+                self.add(x, y)
+
+
+class SegmentRope:
+    """
+    A rope of any length, moved an instruction at a time. Each knot's moves
+    are worked out from the moves of the knot in front, as runs of the same
+    step, so a knot following in a straight line costs O(1) however far it goes.
+    """
+    def __init__(self, n: int = 10):
+        self.n = n
+        self.xs = array('q', bytes(8 * n))
+        self.ys = array('q', bytes(8 * n))
+
+    def __repr__(self):
+        return f"SegmentRope({list(self.xs)}, {list(self.ys)})"
+
+    def move(self, direction: str, distance: int, visited: list[Visited] | None = None) -> Runs:
+        """
+        move the head, and return the moves the tail made, marking where
+        every knot goes in visited if given
+        """
+        xs, ys = self.xs, self.ys
+        runs = [(*DIRECTIONS[direction], distance)]
+        for i in range(self.n):
+            if i:
+                runs = follow(runs, xs[i - 1] - xs[i], ys[i - 1] - ys[i])
+                # the knot in front's new position wasn't needed until now
+                xs[i - 1], ys[i - 1] = x, y
+            if not runs:
+                # this knot didn't move, so nothing behind it will either
+                return []
+            x, y = xs[i], ys[i]
+            if visited is not None:
+                visited[i].add_runs(x, y, runs)
+            for dx, dy, count in runs:
+                x += dx * count
+                y += dy * count
+        xs[-1], ys[-1] = x, y
+        return runs
+
+    def run(self, instructions: loader.Source) -> int:
+        visited = Visited()
+        visited.add(self.xs[-1], self.ys[-1])
+        for instruction in loader.iter_lines(instructions):
+            direction, distance = instruction.split()
+            x, y = self.xs[-1], self.ys[-1]
+            visited.add_runs(x, y, self.move(direction, int(distance)))
+        return len(visited)
+
+    def run_all(self, instructions: loader.Source) -> list[int]:
+        """
+        how many cells every knot visits, in one pass; a knot never depends
+        on the ones behind it, so knot i's count is also the tail's count
+        for a rope of i + 1 knots
+        """
+        visited = [Visited() for _ in range(self.n)]
+        for v, x, y in zip(visited, self.xs, self.ys):
+            v.add(x, y)
+        for instruction in loader.iter_lines(instructions):
+            direction, distance = instruction.split()
+            self.move(direction, int(distance), visited)
+        return [len(v) for v in visited]
+
+
+def parse(raw: loader.Source) -> loader.Source:
+    # the ropes read the instructions a line at a time
+    return raw
+
+def part1(instructions: loader.Source) -> int:
+    return SegmentRope(2).run(instructions)
+
+def part2(instructions: loader.Source) -> int:
+    return SegmentRope(10).run(instructions)
+
+
+if __name__ == "__main__":
+    rope = Rope()
+    assert rope.run(RAW) == 13
+
+    long_rope = LongRope(2)
+    assert long_rope.run(RAW) == 13
+
+    assert SegmentRope(2).run(RAW) == 13
+    assert SegmentRope(10).run(RAW) == 1
+    assert SegmentRope(10).run_all(RAW) == [LongRope(n).run(RAW) for n in range(1, 11)]
+
+    with open('day09.txt') as f:
+        instructions = parse(f.read())
+
+    print(part1(instructions))
+    print(part2(instructions))
@@ -1,6 +1,11 @@
 from dataclasses import dataclass, field
 from typing import Iterator
 
+import instrument
+import loader
+
+metrics = instrument.get(__name__)
+
 @dataclass
 class Device:
     X: int = 1
@@ -10,12 +15,9 @@ class Device:
 
 
     def step(self, instruction: str) -> int:
-        print("cycle", self.cycle, "X", self.X, "addxs")
-        print("instruction", instruction)
-        print("prev signal_strengths", self.signal_strengths[-2:])
+        metrics.count("instructions")
 
         signal_strength = self.X * self.cycle
-        print("signal strength", signal_strength)
 
         match instruction.split():
             case ["noop"]:
@@ -33,8 +35,8 @@ class Device:
 
         return signal_strength
 
-    def run(self, instructions: str) -> None:
-        for instruction in instructions.splitlines():
+    def run(self, instructions: loader.Source) -> None:
+        for instruction in loader.iter_lines(instructions):
             self.step(instruction)
 
 
@@ -42,10 +44,7 @@ RAW1 = """noop
 addx 3
 addx -5"""
 
-DEVICE1 = Device()
-DEVICE1.run(RAW1)
-
-def run(instructions: str) -> int:
+def run(instructions: loader.Source) -> int:
     device = Device()
     device.run(instructions)
 
@@ -203,17 +202,6 @@ noop
 noop
 noop"""
 
-assert run(RAW2) == 13140
-
-with open('day10.txt') as f:
-    raw = f.read()
-
-print(run(raw))
-
-# now we need to draw
-device = Device()
-device.run(raw)
-
 def visualize(xs: list[int]) -> str:
     res = []
     for row in range(6):
@@ -228,4 +216,31 @@ def visualize(xs: list[int]) -> str:
                 outrow.append(".")
         res.append(outrow)
 
-    return "\n".join("".join(row) for row in res)
\ No newline at end of file
+    return "\n".join("".join(row) for row in res)
+
+
+def parse(raw: loader.Source) -> loader.Source:
+    # the device reads the instructions a line at a time
+    return raw
+
+def part1(instructions: loader.Source) -> int:
+    return run(instructions)
+
+def part2(instructions: loader.Source) -> str:
+    # now we need to draw
+    device = Device()
+    device.run(instructions)
+    return visualize(device.xs)
+
+
+if __name__ == "__main__":
+    DEVICE1 = Device()
+    DEVICE1.run(RAW1)
+
+    assert run(RAW2) == 13140
+
+    with open('day10.txt') as f:
+        instructions = parse(f.read())
+
+    print(part1(instructions))
+    print(part2(instructions))
@@ -1,4 +1,5 @@
 from typing import Callable
+import copy
 import operator
 
 
@@ -151,16 +152,24 @@ def monkey_business_level(game: KeepAway, nr: int = 20) -> int:
     ics = sorted(game.inspection_counts.values(), reverse=True)
     return ics[0] * ics[1]
 
-assert monkey_business_level(KeepAway(Monkey.parse_all(RAW))) == 10605
-assert monkey_business_level(KeepAway(Monkey.parse_all(RAW), use_relief=False), nr=10000) == 2713310158
+parse = Monkey.parse_all
 
-with open('day11.txt') as f:
-    raw = f.read()
+def part1(monkeys: list[Monkey]) -> int:
+    # playing moves the items around, so work on a copy
+    return monkey_business_level(KeepAway(copy.deepcopy(monkeys)))
 
-monkeys = Monkey.parse_all(raw)
-keep_away = KeepAway(monkeys)
-print(monkey_business_level(keep_away))
+def part2(monkeys: list[Monkey]) -> int:
+    return monkey_business_level(KeepAway(copy.deepcopy(monkeys), use_relief=False), nr=10000)
 
-monkeys = Monkey.parse_all(raw)
-keep_away = KeepAway(monkeys, use_relief=False)
-print(monkey_business_level(keep_away, nr=10000))
+
+if __name__ == "__main__":
+    assert monkey_business_level(KeepAway(Monkey.parse_all(RAW))) == 10605
+    assert monkey_business_level(KeepAway(Monkey.parse_all(RAW), use_relief=False), nr=10000) == 2713310158
+
+    with open('day11.txt') as f:
+        raw = f.read()
+
+    monkeys = parse(raw)
+
+    print(part1(monkeys))
+    print(part2(monkeys))
@@ -4,10 +4,12 @@ from string import ascii_lowercase
 from collections import deque
 from typing import Tuple
 
+import instrument
+
 DEBUG = True
-logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+metrics = instrument.get(__name__)
 
 RAW = """Sabqponm
 abcryxxl
@@ -38,6 +40,7 @@ def find_shortest_path(grid: Grid, pos: Tuple[int, int] = (-1, -1)) -> int:
 
     while queue:
         pos, steps = queue.popleft()
+        metrics.count("nodes_expanded")
         i, j = pos
         if grid[i][j] == "E":
             return steps
@@ -81,6 +84,7 @@ def find_shortest_path_from_an_a(grid: Grid) -> int:
 
         while queue:
             pos, steps = queue.popleft()
+            metrics.count("nodes_expanded")
             #print(pos, steps, queue)
             i, j = pos
             if grid[i][j] == "E":
@@ -104,16 +108,26 @@ def find_shortest_path_from_an_a(grid: Grid) -> int:
                 visited.add((i2, j2))
                 queue.append(((i2, j2), steps + 1))
 
-    print(so_far)
-    print(min(so_far.values()))
+    metrics.trace("shortest_paths", starts=len(apos), reached=len(so_far))
     return min(so_far.values())
 
 GRID = parse(RAW)
-assert find_shortest_path(GRID) == 31
-assert find_shortest_path_from_an_a(GRID) == 29
 
-with open('day12.txt') as f:
-    grid = parse(f.read())
+def part1(grid: Grid) -> int:
+    return find_shortest_path(grid)
+
+def part2(grid: Grid) -> int:
+    return find_shortest_path_from_an_a(grid)
+
+
+if __name__ == "__main__":
+    logging.basicConfig()
+
+    assert find_shortest_path(GRID) == 31
+    assert find_shortest_path_from_an_a(GRID) == 29
+
+    with open('day12.txt') as f:
+        grid = parse(f.read())
 
-print(find_shortest_path(grid))
-print(find_shortest_path_from_an_a(grid))
\ No newline at end of file
+    print(part1(grid))
+    print(part2(grid))
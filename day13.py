@@ -76,14 +76,6 @@ def right_order_sum(pairs: list[Pair]) -> int:
 
     return res
 
-assert right_order_sum(PAIRS) == 13
-
-with open('day13.txt') as f:
-    raw = f.read()
-pairs = parse(raw)
-
-print(right_order_sum(pairs))
-
 
 def find_divider_packets(pairs: list[Pair]) -> int:
     # flatten
@@ -99,6 +91,20 @@ def find_divider_packets(pairs: list[Pair]) -> int:
 
     return a * b
 
-assert find_divider_packets(PAIRS) == 140
+def part1(pairs: list[Pair]) -> int:
+    return right_order_sum(pairs)
+
+def part2(pairs: list[Pair]) -> int:
+    return find_divider_packets(pairs)
+
+
+if __name__ == "__main__":
+    assert right_order_sum(PAIRS) == 13
+    assert find_divider_packets(PAIRS) == 140
+
+    with open('day13.txt') as f:
+        raw = f.read()
+    pairs = parse(raw)
 
-print(find_divider_packets(pairs))
\ No newline at end of file
+    print(part1(pairs))
+    print(part2(pairs))
@@ -63,13 +63,10 @@ def simulate_sand(paths: list[Path], entry_x: int = 500) -> int:
 
     raise ValueError("Simulation failed")
 
-PATHS = [parse_path(line) for line in RAW.splitlines()]
-assert simulate_sand(PATHS) == 24
+def parse(raw: str) -> list[Path]:
+    return [parse_path(line) for line in raw.splitlines()]
 
-with open('day14.txt') as f:
-    raw = f.read()
-paths = [parse_path(line) for line in raw.splitlines()]
-print(simulate_sand(paths))
+PATHS = parse(RAW)
 
 def show(world: World):
     min_x = min(x for x, y in world)
@@ -118,5 +115,20 @@ def simulate_sand2(paths: list[Path], entry_x: int = 500) -> int:
     raise ValueError("Simulation failed")
 
 
-assert simulate_sand2(PATHS) == 93
-print(simulate_sand2(paths))
\ No newline at end of file
+def part1(paths: list[Path]) -> int:
+    return simulate_sand(paths)
+
+def part2(paths: list[Path]) -> int:
+    return simulate_sand2(paths)
+
+
+if __name__ == "__main__":
+    assert simulate_sand(PATHS) == 24
+    assert simulate_sand2(PATHS) == 93
+
+    with open('day14.txt') as f:
+        raw = f.read()
+    paths = parse(raw)
+
+    print(part1(paths))
+    print(part2(paths))
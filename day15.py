@@ -1,7 +1,10 @@
 
 from dataclasses import dataclass
 import re
-import tqdm
+
+import instrument
+
+metrics = instrument.get(__name__)
 
 RAW = """Sensor at x=2, y=18: closest beacon is at x=-2, y=15
 Sensor at x=9, y=16: closest beacon is at x=10, y=16
@@ -50,10 +53,6 @@ def find_allowable(
     # descending by right endpoint
     intervals_hi_to_lo = sorted(bad_intervals, key=lambda pair: pair[1], reverse=True)
 
-    print(bad_intervals)
-    print(intervals_lo_to_hi)
-    print(intervals_hi_to_lo)
-
     left = lo - 1
 
     for x, y in intervals_lo_to_hi:
@@ -70,7 +69,8 @@ def find_allowable(
         else:
             right = min(right, x)
 
-    print(left, right)
+    if metrics.sampled("allowable", every=1_000):
+        metrics.trace("allowable", intervals=len(bad_intervals), left=left, right=right)
 
     if left + 1 < right:
         return left + 1
@@ -108,17 +108,6 @@ def find_unallowable_columns(sensors: list[Sensor], row: int) -> set[int]:
         
             
 
-assert len(find_unallowable_columns(SENSORS, 10)) == 26
-
-with open('day15.txt') as f:
-    raw = f.read()
-
-sensors = [Sensor.from_string(s) for s in raw.splitlines()]
-
-#uc = find_unallowable_columns(sensors, 2_000_000)
-
-#print(uc)
-#print(len(uc))
 
 
 def find_allowable_column(
@@ -130,7 +119,7 @@ def find_allowable_column(
     unallowable_intervals: list[Interval] = []
 
     for sensor in sensors:
-        print(sensor)
+        metrics.count("sensors_checked")
         x, y = sensor.position
         bx, by = sensor.beacon
 
@@ -150,13 +139,10 @@ def find_allowable_column(
             elif (b, row) == (bx, by):
                 b -= 1
 
-            print(a, b)
             if a <= b:
                 unallowable_intervals.append((a, b))
 
-    print(unallowable_intervals)
     col = find_allowable(unallowable_intervals, lo, hi)
-    print(col)
 
     if col is not None and (row, col) not in {s.position for s in sensors} | {s.beacon for s in sensors}:
         return col
@@ -166,21 +152,18 @@ def find_allowable_column(
 
 def find_beacon(sensors: list[Sensor], lo: int, hi: int) -> XY:
     for i in range(lo, hi + 1):
-        print()
+        metrics.count("rows")
         col = find_allowable_column(sensors, i, lo, hi)
-        print(i, col)
         if col is not None:
             yield (i, col)
 #    raise ValueError()
 
-print(list(find_beacon(SENSORS, 0, 20)))
-
-# for i in range()
-# uc = find_allowable_column(sensors, 2_000_002, 0, 4_000_000)
-# print(uc)
-
 def solve(sensors: list[Sensor], lo: int, hi: int) -> XY | None:
-    for i in tqdm.trange(lo, hi + 1):
+    for i in range(lo, hi + 1):
+        metrics.count("rows")
+        if metrics.sampled("progress", every=100_000):
+            metrics.trace("progress", row=i)
+
         # find all the locations in row i that cannot be a beacon
         # do this by finding the intervals ruled out by each sensor
         intervals = []
@@ -225,8 +208,30 @@ def solve(sensors: list[Sensor], lo: int, hi: int) -> XY | None:
             assert left == right - 2
             return (i, left + 1)
 
-res = solve(sensors, 0, 4_000_000)
-if res is not None:
-    print(res)
+def parse(raw: str) -> list[Sensor]:
+    return [Sensor.from_string(s) for s in raw.splitlines()]
+
+def part1(sensors: list[Sensor], row: int = 2_000_000) -> int:
+    return len(find_unallowable_columns(sensors, row))
+
+def part2(sensors: list[Sensor], lo: int = 0, hi: int = 4_000_000) -> int:
+    res = solve(sensors, lo, hi)
+    if res is None:
+        raise ValueError("No beacon found")
     y, x = res
-    print(x * 4000000 + y)
\ No newline at end of file
+    return x * 4000000 + y
+
+
+if __name__ == "__main__":
+    assert len(find_unallowable_columns(SENSORS, 10)) == 26
+    assert part2(SENSORS, 0, 20) == 56000011
+
+    print(list(find_beacon(SENSORS, 0, 20)))
+
+    with open('day15.txt') as f:
+        raw = f.read()
+
+    sensors = parse(raw)
+
+    print(part1(sensors))
+    print(part2(sensors))
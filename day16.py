@@ -4,6 +4,10 @@ from collections import deque
 import heapq
 import re
 
+import instrument
+
+metrics = instrument.get(__name__)
+
 RAW = """Valve AA has flow rate=0; tunnels lead to valves DD, II, BB
 Valve BB has flow rate=13; tunnels lead to valves CC, AA
 Valve CC has flow rate=2; tunnels lead to valves DD, BB
@@ -78,10 +82,10 @@ class Network:
         while q:
             qitem = heapq.heappop(q)
             count += 1
-            if count % 100_000 == 0:
-                print(count)
-                print(qitem)
-                print(best)
+            metrics.count("nodes_expanded")
+            metrics.observe("queue_size", len(q))
+            if metrics.sampled("progress", every=100_000):
+                metrics.trace("progress", count=count, time=qitem.time, best=best, queue_size=len(q))
 
             #print()
             #print("popping", qitem)
@@ -128,11 +132,6 @@ class Network:
 NETWORK = Network.from_string(RAW)
 #print(NETWORK.most_pressure(30, 'AA'))
 
-with open('day16.txt') as f:
-    raw = f.read()
-network = Network.from_string(raw)
-# print(network.most_pressure(30, 'AA'))
-
 
 ### Elephants
 
@@ -192,11 +191,10 @@ class ENetwork:
             qitem = heapq.heappop(q)
             #print(qitem)
             count += 1
-            if count % 100_000 == 0:
-                print(count)
-                print(qitem)
-                print("best", best)
-                print("qsize", len(q))
+            metrics.count("nodes_expanded")
+            metrics.observe("queue_size", len(q))
+            if metrics.sampled("progress", every=100_000):
+                metrics.trace("progress", count=count, time=qitem.time, best=best, queue_size=len(q))
 
             #print()
             #print("popping", qitem)
@@ -208,8 +206,7 @@ class ENetwork:
             # out of time or all good valves are open
             if released > best:
                 best = released
-                print("new best", best)
-                print(qitem)
+                metrics.trace("new_best", best=best, time=time)
             if time == num_steps or valves_with_flow == open:
                 continue
 
@@ -343,9 +340,11 @@ class ONetwork:
         return tot
 
 
-    def most_pressure(self, num_steps: int = 26, start: str = "AA") -> int:
+    def most_pressure(self, num_steps: int = 26, start: str = "AA", elephant: bool = True) -> int:
         best_possible = self.best_possible(0, num_steps, set())
-        q = [OQItem(-best_possible, start, start, 0, 0, 0, set())]
+        # without an elephant, it starts out of time and never moves
+        etime = 0 if elephant else num_steps
+        q = [OQItem(-best_possible, start, start, 0, etime, 0, set())]
 
         best = -1
         best_qitem = None
@@ -355,11 +354,10 @@ class ONetwork:
             qitem = heapq.heappop(q)
             #print(qitem)
             count += 1
-            if count % 100_000 == 0:
-                print(count)
-                print(qitem)
-                print("best", best)
-                print("qsize", len(q))
+            metrics.count("nodes_expanded")
+            metrics.observe("queue_size", len(q))
+            if metrics.sampled("progress", every=100_000):
+                metrics.trace("progress", count=count, time=qitem.time, best=best, queue_size=len(q))
 
             #print()
             #print("popping", qitem)
@@ -373,7 +371,7 @@ class ONetwork:
             if released > best:
                 best = released
                 best_qitem = qitem
-                print("new best", best)
+                metrics.trace("new_best", best=best, time=time, etime=etime)
                 #print(qitem)
 
             # all open, so nothing else to do
@@ -438,6 +436,22 @@ ONETWORK = ONetwork.from_string(RAW)
 
 #bq = ONETWORK.most_pressure(26, 'AA')
 
-onetwork = ONetwork.from_string(raw)
-best = onetwork.most_pressure(26, 'AA')
-print(best)
\ No newline at end of file
+
+def parse(raw: str) -> list[Valve]:
+    return [Valve.from_string(line) for line in raw.splitlines()]
+
+def part1(valves: list[Valve]) -> int:
+    return ONetwork(valves).most_pressure(30, 'AA', elephant=False)
+
+def part2(valves: list[Valve]) -> int:
+    return ONetwork(valves).most_pressure(26, 'AA')
+
+
+if __name__ == "__main__":
+    with open('day16.txt') as f:
+        raw = f.read()
+
+    valves = parse(raw)
+
+    print(part1(valves))
+    print(part2(valves))
@@ -155,15 +155,6 @@ def find_height(pattern: str, num_steps: int) -> int:
 
     return height['height']
 
-assert find_height(GASES, 2022) == 3068
-
-with open('day17.txt') as f:
-    gases = f.read().strip()
-
-occ = find_height(gases, 2022)
-
-print(occ)
-
 def display(occupied: set[XY], nr: int = 10):
     y = max(y for x, y in occupied)
 
@@ -171,9 +162,23 @@ def display(occupied: set[XY], nr: int = 10):
         print("|" + ''.join('#' if (x, y) in occupied else '.' for x in range(8)) + "|")
         y -= 1
 
-# look for a pattern
-import pandas as pd
+def parse(raw: str) -> str:
+    return raw.strip()
+
+def part1(gases: str) -> int:
+    return find_height(gases, 2022)
+
+
+if __name__ == "__main__":
+    assert find_height(GASES, 2022) == 3068
+
+    with open('day17.txt') as f:
+        gases = parse(f.read())
+
+    print(part1(gases))
 
-it = run(gases)
-df = pd.DataFrame([next(it) for _ in tqdm.trange(100_000)])
+    # look for a pattern
+    import pandas as pd
 
+    it = run(gases)
+    df = pd.DataFrame([next(it) for _ in tqdm.trange(100_000)])
@@ -2,6 +2,8 @@ from typing import Iterator
 from dataclasses import dataclass
 from collections import deque
 
+import loader
+
 RAW = """2,2,2
 1,2,2
 3,2,2
@@ -47,10 +49,10 @@ class Droplet:
         self.zhi = max(z for _, _, z in self.points)
 
     @staticmethod
-    def parse(raw: str) -> 'Droplet':
+    def parse(raw: loader.Source) -> 'Droplet':
         return Droplet({
             tuple(map(int, line.split(",")))
-            for line in raw.splitlines()
+            for line in loader.iter_lines(raw)
         })
 
     def _surface_area(self, point: Point) -> int:
@@ -91,13 +93,24 @@ class Droplet:
 
 
 DROPLET = Droplet.parse(RAW)
-assert DROPLET.surface_area() == 64
-assert DROPLET.exterior_surface_area() == 58
 
-with open('day18.txt') as f:
-    raw = f.read()
+parse = Droplet.parse
+
+def part1(droplet: Droplet) -> int:
+    return droplet.surface_area()
+
+def part2(droplet: Droplet) -> int:
+    return droplet.exterior_surface_area()
+
+
+if __name__ == "__main__":
+    assert DROPLET.surface_area() == 64
+    assert DROPLET.exterior_surface_area() == 58
+
+    with open('day18.txt') as f:
+        raw = f.read()
 
-droplet = Droplet.parse(raw)
+    droplet = parse(raw)
 
-print(droplet.surface_area())
-print(droplet.exterior_surface_area())
\ No newline at end of file
+    print(part1(droplet))
+    print(part2(droplet))
@@ -3,7 +3,10 @@ from dataclasses import dataclass
 from typing import NamedTuple, Iterator
 from collections import deque
 import heapq
-import tqdm
+
+import instrument
+
+metrics = instrument.get(__name__)
 
 RAW = """Blueprint 1: Each ore robot costs 4 ore. Each clay robot costs 2 ore. Each obsidian robot costs 3 ore and 14 clay. Each geode robot costs 2 ore and 7 obsidian.
 Blueprint 2: Each ore robot costs 2 ore. Each clay robot costs 3 ore. Each obsidian robot costs 3 ore and 8 clay. Each geode robot costs 3 ore and 12 obsidian."""
@@ -108,10 +111,11 @@ def max_geodes(blueprint: Blueprint, max_time: int = 24) -> int:
 
     while q:
         priority, state = heapq.heappop(q)
+        metrics.count("nodes_expanded")
+        metrics.observe("queue_size", len(q))
         omg = priority[0]
         if omg > best_omg:
-            print("new omg", omg)
-            print(state)
+            metrics.trace("new_omg", omg=omg, time=state.time)
             best_omg = omg
         #print(state)
         #print(omg)
@@ -137,8 +141,7 @@ def max_geodes(blueprint: Blueprint, max_time: int = 24) -> int:
             #print()
             if new_state.geode > best:
                 best = new_state.geode
-                print("new best", new_state)
-                print("best omg", best_omg)
+                metrics.trace("new_best", best=best, time=new_state.time, best_omg=best_omg)
             new_priority = ( -new_state.overestimate_max_geodes(blueprint, max_time), -new_state.geode_robots, -new_state.geode)
             heapq.heappush(q, (new_priority, new_state))
 
@@ -150,30 +153,38 @@ def quality_level(blueprint: Blueprint, max_time: int = 24) -> int:
 def total_quality_level(blueprints: list[Blueprint], max_time: int = 24) -> int:
     total = 0
 
-    for blueprint in tqdm.tqdm(blueprints):
-        print(blueprint)
+    for blueprint in blueprints:
         ql = quality_level(blueprint, max_time)
-        print(ql)
+        metrics.trace("quality_level", blueprint=blueprint.id, quality_level=ql)
         total += ql
     
     return total
 
-with open('day19.txt') as f:
-    raw = f.read()
-
-blueprints = [Blueprint.from_string(s) for s in raw.splitlines()]
-
-#print(total_quality_level(blueprints, 24))
-
 def geode_product(blueprints: list[Blueprint], max_time: int = 32) -> int:
     product = 1
 
-    for blueprint in tqdm.tqdm(blueprints):
-        print(blueprint)
+    for blueprint in blueprints:
         geodes = max_geodes(blueprint, max_time)
-        print(geodes)
+        metrics.trace("max_geodes", blueprint=blueprint.id, geodes=geodes)
         product *= geodes
 
     return product
 
-print(geode_product(blueprints[:3], 32))
\ No newline at end of file
+def parse(raw: str) -> list[Blueprint]:
+    return [Blueprint.from_string(s) for s in raw.splitlines()]
+
+def part1(blueprints: list[Blueprint]) -> int:
+    return total_quality_level(blueprints, 24)
+
+def part2(blueprints: list[Blueprint]) -> int:
+    return geode_product(blueprints[:3], 32)
+
+
+if __name__ == "__main__":
+    with open('day19.txt') as f:
+        raw = f.read()
+
+    blueprints = parse(raw)
+
+    #print(part1(blueprints))
+    print(part2(blueprints))
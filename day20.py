@@ -1,5 +1,9 @@
 from dataclasses import dataclass, field
-import tqdm
+
+import instrument
+import loader
+
+metrics = instrument.get(__name__)
 
 RAW = """1
 2
@@ -43,6 +47,7 @@ class EncryptedFile:
             node.next = self.nodes[(i + 1) % len(self.nodes)]
 
     def mix(self):
+        metrics.count("mixes")
         for i in range(self.n):
             #print(i, str(self))
             self.step()
@@ -87,27 +92,36 @@ class EncryptedFile:
         self.i = (self.i + 1) % len(self.numbers)
 
 
-EF = EncryptedFile(NUMBERS)
-EF.mix()
-assert EF.grove() == 3
-
 KEY = 811589153
-EF = EncryptedFile(NUMBERS, KEY)
-for _ in range(10):
-    EF.mix()
-assert EF.grove() == 1623178306
 
+def parse(raw: loader.Source) -> list[int]:
+    return [int(x) for x in loader.iter_lines(raw)]
 
-with open('day20.txt') as f:
-    raw = f.read()
-numbers = [int(x) for x in raw.splitlines()]
+def part1(numbers: list[int]) -> int:
+    ef = EncryptedFile(numbers)
+    ef.mix()
+    return ef.grove()
 
-# part 1
-#ef = EncryptedFile(numbers)
-#ef.mix()
-#print(ef.grove())
+def part2(numbers: list[int]) -> int:
+    ef = EncryptedFile(numbers, KEY)
+    for _ in range(10):
+        ef.mix()
+    return ef.grove()
 
-ef = EncryptedFile(numbers, KEY)
-for _ in tqdm.trange(10):
-    ef.mix()
-print(ef.grove())
\ No newline at end of file
+
+if __name__ == "__main__":
+    EF = EncryptedFile(NUMBERS)
+    EF.mix()
+    assert EF.grove() == 3
+
+    EF = EncryptedFile(NUMBERS, KEY)
+    for _ in range(10):
+        EF.mix()
+    assert EF.grove() == 1623178306
+
+    with open('day20.txt') as f:
+        raw = f.read()
+    numbers = parse(raw)
+
+    #print(part1(numbers))
+    print(part2(numbers))
@@ -5,6 +5,10 @@ don't look at me, look at day21.v2.py
 
 from dataclasses import dataclass, field
 
+import instrument
+
+metrics = instrument.get(__name__)
+
 RAW = """root: pppw + sjmn
 dbpl: 5
 cczh: sllz + lgvd
@@ -117,7 +121,7 @@ class Monkeys:
                 else:
                     pass
 
-        print("path", path)
+        metrics.trace("path", path=path)
 
         monkey = self.monkeys['root']
         if monkey.left == path[-1][1]:
@@ -128,7 +132,7 @@ class Monkeys:
             assert monkey.left is not None
             target_value = self.dyell(monkey.left)
 
-        print('initial target value', target_value)
+        metrics.trace("root", target_value=target_value)
 
         # now get root off the path
         path.pop()
@@ -137,7 +141,7 @@ class Monkeys:
             dir, name = path.pop()
             monkey = self.monkeys[name]
 
-            print(dir, name, monkey)
+            metrics.count("path_steps")
 
             if name == 'humn':
                 return target_value
@@ -150,7 +154,6 @@ class Monkeys:
                 left = self.monkeys[monkey.left]
                 child_value = self.dyell(root=left.name)
 
-            print("child value", child_value)
 
             # have target_value, child_value, and op
             if monkey.op == "+":
@@ -180,15 +183,21 @@ class Monkeys:
             else:
                 raise Exception("Invalid op")
 
-            print("op", monkey.op)
-            print("new target", target_value)
+            if metrics.sampled("step", every=10):
+                metrics.trace("step", dir=dir, name=name, op=monkey.op, child_value=child_value, target_value=target_value)
 
 
 MONKEYS = Monkeys.parse(RAW)
 
-assert MONKEYS.dyell() == 152
+parse = Monkeys.parse
+
+def part1(monkeys: Monkeys) -> int:
+    return monkeys.dyell()
+
 
-with open('day21.txt') as f:
-    monkeys = Monkeys.parse(f.read())
-    print(monkeys.dyell())
+if __name__ == "__main__":
+    assert MONKEYS.dyell() == 152
 
+    with open('day21.txt') as f:
+        monkeys = parse(f.read())
+        print(part1(monkeys))
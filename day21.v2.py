@@ -1,6 +1,10 @@
 from dataclasses import dataclass, field
 from typing import Union
 
+import instrument
+
+metrics = instrument.get(__name__)
+
 
 RAW = """root: pppw + sjmn
 dbpl: 5
@@ -34,7 +38,7 @@ class MathOp:
 
 Monkey = Specific | MathOp
 
-def parse(line: str) -> Monkey:
+def parse_monkey(line: str) -> Monkey:
     name, rest = line.split(": ")
     if " " in rest:
         left, op, right = rest.split(" ")
@@ -55,7 +59,7 @@ class Monkeys:
 
     @staticmethod
     def parse(raw: str) -> 'Monkeys':
-        monkeys = [parse(line) for line in raw.splitlines()]
+        monkeys = [parse_monkey(line) for line in raw.splitlines()]
         return Monkeys({m.name: m for m in monkeys})
 
     def calculate(self, monkey: Monkey | None = None) -> int:
@@ -100,9 +104,9 @@ class Monkeys:
             match path.pop():
                 case MathOp(name='root', left=left, right=right):
                     target_value = self.calculate(right) if left == path[-1] else self.calculate(left)
-                    print("root: target value", target_value)
+                    metrics.trace("root", target_value=target_value)
                 case MathOp(name='humn') | Specific(name='humn'):
-                    print("humn: target value", target_value)
+                    metrics.trace("humn", target_value=target_value)
                     return target_value
                 case MathOp(op=op, left=left, right=right):
                     if left == path[-1]:
@@ -112,10 +116,9 @@ class Monkeys:
                         known = 'left'
                         child_value = self.calculate(left)
 
-                    print("op", op, "left", left, "right", right)
-                    print("target value", target_value)
-                    print("known", known)
-                    print("child value", child_value)
+                    metrics.count("path_steps")
+                    if metrics.sampled("step", every=10):
+                        metrics.trace("step", op=op, left=left.name, right=right.name, target_value=target_value, known=known, child_value=child_value)
                     
                     match op:
                         case "+":
@@ -150,10 +153,21 @@ class Monkeys:
 
 
 MONKEYS = Monkeys.parse(RAW)
-assert MONKEYS.calculate() == 152
-assert MONKEYS.find_human_value() == 301
 
-with open('day21.txt') as f:
-    monkeys = Monkeys.parse(f.read())
-    print(monkeys.calculate())
-    print(monkeys.find_human_value())
+parse = Monkeys.parse
+
+def part1(monkeys: Monkeys) -> int:
+    return monkeys.calculate()
+
+def part2(monkeys: Monkeys) -> int:
+    return monkeys.find_human_value()
+
+
+if __name__ == "__main__":
+    assert MONKEYS.calculate() == 152
+    assert MONKEYS.find_human_value() == 301
+
+    with open('day21.txt') as f:
+        monkeys = parse(f.read())
+        print(part1(monkeys))
+        print(part2(monkeys))
@@ -0,0 +1,125 @@
+"""
+Counters, timers and trace events for the solvers' hot loops, instead of print.
+
+    metrics = instrument.get(__name__)
+
+    metrics.count("nodes_expanded")
+    metrics.observe("queue_size", len(q))  # keeps the max
+    with metrics.timer("distances"):
+        ...
+    if metrics.sampled("progress", every=100_000):
+        metrics.trace("progress", count=count, best=best)
+
+Everything is a no-op until instrument.enable() is called (or ADVENT_METRICS
+is set in the environment), so leaving the calls in costs next to nothing.
+Traces in hot loops should go behind sampled(), so that the fields aren't
+even built unless the event is going to be kept.
+"""
+import os
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator
+
+# only keep the most recent trace events
+MAX_EVENTS = 10_000
+
+_enabled = bool(os.environ.get("ADVENT_METRICS"))
+
+
+class Metrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.counters: Counter[str] = Counter()
+        self.maxima: dict[str, float] = {}
+        self.timings: Counter[str] = Counter()
+        self.events: deque[dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self.samples: Counter[str] = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return _enabled
+
+    def count(self, key: str, n: int = 1) -> None:
+        if _enabled:
+            self.counters[key] += n
+
+    def observe(self, key: str, value: float) -> None:
+        if _enabled and value > self.maxima.get(key, float("-inf")):
+            self.maxima[key] = value
+
+    def timer(self, key: str) -> ContextManager:
+        if not _enabled:
+            return nullcontext()
+        return self._timer(key)
+
+    @contextmanager
+    def _timer(self, key: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[key] += time.perf_counter() - start
+
+    def trace(self, event: str, **fields: Any) -> None:
+        if _enabled:
+            self.events.append({"event": event, **fields})
+
+    def sampled(self, key: str, every: int) -> bool:
+        """true for the 1st, (every + 1)th, ... call with this key, never if disabled"""
+        if not _enabled:
+            return False
+        self.samples[key] += 1
+        return (self.samples[key] - 1) % every == 0
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "maxima": dict(self.maxima),
+            "timings": dict(self.timings),
+            "events": list(self.events),
+        }
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.maxima.clear()
+        self.timings.clear()
+        self.events.clear()
+        self.samples.clear()
+
+
+_metrics: dict[str, Metrics] = {}
+
+
+def get(name: str) -> Metrics:
+    if name not in _metrics:
+        _metrics[name] = Metrics(name)
+    return _metrics[name]
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def report() -> dict[str, dict[str, Any]]:
+    """everything recorded so far, by name"""
+    return {
+        name: metrics.report()
+        for name, metrics in _metrics.items()
+        if metrics.counters or metrics.maxima or metrics.timings or metrics.events
+    }
+
+
+def reset() -> None:
+    for metrics in _metrics.values():
+        metrics.reset()
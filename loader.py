@@ -0,0 +1,69 @@
+"""
+Read puzzle inputs a line (or a blank-line separated record) at a time,
+without making copies of the whole input.
+
+    with loader.mapped("day01.txt") as buf:
+        elves = day01.parse(buf)
+
+The parsers that use this take a str, bytes or a memory-mapped file, and
+iter_lines / iter_records also take an open file, text or binary.
+"""
+import io
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+Source = str | bytes | mmap.mmap
+
+
+@contextmanager
+def mapped(path: str | Path) -> Iterator[Source]:
+    """memory-map the file at path, read only"""
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # can't mmap an empty file
+            yield b""
+            return
+        with buf:
+            yield buf
+
+
+def iter_lines(source: Source | IO[str] | IO[bytes]) -> Iterator[str]:
+    """the lines of source without their newlines, like str.splitlines()"""
+    if isinstance(source, io.IOBase):
+        # a file already reads a line at a time
+        for line in source:
+            if isinstance(line, bytes):
+                line = line.decode()
+            yield line.rstrip("\n")
+        return
+
+    # find and slice a line at a time, rather than copying all of it into a StringIO
+    is_str = isinstance(source, str)
+    newline_char = "\n" if is_str else b"\n"
+
+    pos = 0
+    end = len(source)
+    while pos < end:
+        newline = source.find(newline_char, pos)
+        if newline == -1:
+            newline = end
+        line = source[pos:newline]
+        yield line if is_str else line.decode()
+        pos = newline + 1
+
+
+def iter_records(source: Source | IO[str] | IO[bytes]) -> Iterator[list[str]]:
+    """groups of lines separated by blank lines"""
+    record: list[str] = []
+    for line in iter_lines(source):
+        if line:
+            record.append(line)
+        elif record:
+            yield record
+            record = []
+    if record:
+        yield record
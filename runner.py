@@ -0,0 +1,142 @@
+"""
+Run (day, part, input) jobs across a process pool.
+
+    python runner.py                        # every day on its dayNN.txt
+    python runner.py 15 16 19 20            # just some days
+    python runner.py --input-dir a --input-dir b
+    python runner.py --no-cache             # solve everything again
+    python runner.py 16 --no-cache --metrics   # with counters from instrument.py
+
+Each input dir is expected to hold dayNN.txt files. Answers are cached
+(see cache.py), so inputs that have been solved before come back right away.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import instrument
+import solvers
+from cache import MISSING, ResultCache
+
+
+# these take minutes, so they get started first and the wall clock
+# ends up close to the slowest job instead of the sum of all of them
+SLOW_JOBS = [
+    (15, 2),  # solve
+    (16, 2),  # ONetwork.most_pressure
+    (19, 2),  # geode_product
+    (20, 2),  # EncryptedFile.mix
+    (19, 1),
+    (15, 1),
+]
+
+
+class Job(NamedTuple):
+    day: int
+    part: int
+    path: Path
+
+
+class Result(NamedTuple):
+    job: Job
+    answer: Any
+    seconds: float
+    error: str | None = None
+    cached: bool = False
+    metrics: dict | None = None
+
+
+def priority(job: Job) -> int:
+    key = (job.day, job.part)
+    return SLOW_JOBS.index(key) if key in SLOW_JOBS else len(SLOW_JOBS)
+
+
+def make_jobs(days: list[int], input_dirs: list[Path]) -> list[Job]:
+    jobs = []
+    for input_dir in input_dirs:
+        for day in days:
+            path = input_dir / f"day{day:02}.txt"
+            if not path.exists():
+                continue
+            solver = solvers.get_solver(day)
+            parts = [1, 2] if solver.part2 is not None else [1]
+            jobs.extend(Job(day, part, path) for part in parts)
+
+    # sort is stable, so everything else stays in day order
+    return sorted(jobs, key=priority)
+
+
+def run_job(job: Job) -> Result:
+    # workers get reused, so only report what this job recorded
+    instrument.reset()
+    start = time.perf_counter()
+    try:
+        raw = job.path.read_text()
+        answer = solvers.solve(job.day, job.part, raw)
+    except Exception as e:
+        return Result(job, None, time.perf_counter() - start, repr(e))
+    metrics = instrument.report() if instrument.is_enabled() else None
+    return Result(job, answer, time.perf_counter() - start, metrics=metrics)
+
+
+def run_all(jobs: list[Job], max_workers: int | None = None, cache: ResultCache | None = None) -> list[Result]:
+    """run the jobs in a process pool, in the order given"""
+    results = []
+    to_run = []
+    for job in jobs:
+        if cache is not None:
+            answer = cache.get(job.day, job.part, job.path.read_bytes())
+            if answer is not MISSING:
+                results.append(Result(job, answer, 0.0, cached=True))
+                continue
+        to_run.append(job)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run_job, job) for job in to_run]
+        for future in as_completed(futures):
+            result = future.result()
+            if cache is not None and result.error is None:
+                job = result.job
+                cache.put(job.day, job.part, job.path.read_bytes(), result.answer)
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("days", nargs="*", type=int, default=solvers.DAYS)
+    parser.add_argument("--input-dir", type=Path, action="append", dest="input_dirs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--metrics", action="store_true", help="report counters and timers for each job")
+    args = parser.parse_args()
+
+    if args.metrics:
+        # so that the workers have it turned on too
+        os.environ["ADVENT_METRICS"] = "1"
+        instrument.enable()
+
+    jobs = make_jobs(args.days, args.input_dirs or [solvers.HERE])
+    cache = None if args.no_cache else ResultCache()
+
+    start = time.perf_counter()
+    results = run_all(jobs, args.workers, cache)
+    elapsed = time.perf_counter() - start
+
+    for result in sorted(results, key=lambda r: (str(r.job.path.parent), r.job.day, r.job.part)):
+        job = result.job
+        answer = result.answer if result.error is None else f"ERROR {result.error}"
+        timing = "cached" if result.cached else f"{result.seconds:.2f}s"
+        print(f"{job.path} part {job.part} ({timing}):")
+        print(answer)
+        for name, metrics in (result.metrics or {}).items():
+            for kind in ("counters", "maxima", "timings"):
+                for key, value in metrics[kind].items():
+                    print(f"  {name}.{key}: {value}")
+            if metrics["events"]:
+                print(f"  {name}: {len(metrics['events'])} trace events, last {metrics['events'][-1]}")
+
+    print(f"{len(jobs)} jobs in {elapsed:.2f}s")
@@ -0,0 +1,90 @@
+"""
+A registry of the solvers for each day, so they can be used as a library
+(importing a day no longer reads its input or prints anything).
+
+Every day module exposes
+
+    parse(raw: str) -> puzzle
+    part1(puzzle) -> answer
+    part2(puzzle) -> answer  (where part 2 has been solved)
+"""
+import hashlib
+import importlib.util
+import sys
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, NamedTuple
+
+HERE = Path(__file__).parent
+
+# day -> module file, day 21 uses the rewrite
+MODULES = {day: f"day{day:02}.py" for day in range(1, 21)}
+MODULES[21] = "day21.v2.py"
+
+DAYS = sorted(MODULES)
+
+
+class Solver(NamedTuple):
+    day: int
+    parse: Callable[[str], Any]
+    part1: Callable[[Any], Any]
+    part2: Callable[[Any], Any] | None
+    # changes whenever the module's source does
+    version: str = ""
+
+
+def load_module(day: int) -> ModuleType:
+    filename = MODULES[day]
+    # day21.v2 isn't a valid module name
+    name = filename.removesuffix(".py").replace(".", "_")
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, HERE / filename)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@cache
+def get_solver(day: int) -> Solver:
+    if day not in MODULES:
+        raise ValueError(f"No solver for day {day}")
+
+    module = load_module(day)
+    return Solver(day, module.parse, module.part1, getattr(module, "part2", None), source_version(module))
+
+
+def source_version(module: ModuleType) -> str:
+    """
+    a hash of the module's source and of the repo's own modules it imports
+    (loader, instrument, ...), so that changing a helper changes it too
+    """
+    paths = {Path(module.__file__)}
+    for value in vars(module).values():
+        file = getattr(value, "__file__", None)
+        if isinstance(value, ModuleType) and file and Path(file).resolve().parent == HERE.resolve():
+            paths.add(Path(file))
+
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def solve(day: int, part: int, raw: str) -> Any:
+    solver = get_solver(day)
+
+    if part == 1:
+        fn = solver.part1
+    elif part == 2 and solver.part2 is not None:
+        fn = solver.part2
+    else:
+        raise ValueError(f"No solver for day {day} part {part}")
+
+    return fn(solver.parse(raw))